@@ -1,16 +1,33 @@
 
+import asyncio
+import codecs
+import copy
+import datetime
+import hashlib
 import io
+import json
 import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from pathlib import Path
 from typing import Dict, Any, List
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import BackgroundTasks, FastAPI, HTTPException, UploadFile, File
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel, field_validator
 import uvicorn
 
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "speedups" extra
+    orjson = None
+
 from shadow_ai.engine import analyze
-from shadow_ai.parser import parse, ParserError, InvalidInputError, FileTooLargeError
+from shadow_ai.parser import (
+    parse, validate_string_input, ParserError, InvalidInputError, FileTooLargeError
+)
 from shadow_ai.database import init_database, get_database
 
 logging.basicConfig(level=logging.INFO)
@@ -52,10 +69,11 @@ class CodeAnalysisRequest(BaseModel):
     @field_validator('code')
     @classmethod
     def validate_code(cls, v):
-        if not v or not v.strip():
-            raise ValueError('Code cannot be empty')
+        # Length check first so oversized payloads are rejected without a full scan
         if len(v) > 1000000:
             raise ValueError('Code is too long (max 1MB)')
+        if not v or v.isspace():
+            raise ValueError('Code cannot be empty')
         return v
 
 
@@ -155,10 +173,9 @@ def format_analysis_result(analysis_data: Dict[str, Any], source: str, language:
         result_verdict = "Likely Human-Written"
 
     if risk_factors:
-        primary_reasons = risk_factors[:2]
-        reason = ", ".join(primary_reasons)
+        reason = ", ".join(risk_factors[:2])
 
-        patterns_list = [factor.split('(')[0].strip() for factor in risk_factors]
+        patterns_list = [factor.partition('(')[0].strip() for factor in risk_factors]
     else:
         reason = "No significant AI patterns detected"
         patterns_list = []
@@ -179,6 +196,69 @@ def format_analysis_result(analysis_data: Dict[str, Any], source: str, language:
     )
 
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_UPLOAD_BYTES = 5_000_000
+
+
+async def read_upload_text(file: UploadFile, encoding: str = 'utf-8') -> str:
+
+    # Decode chunk by chunk so oversized uploads are rejected before being fully read
+    decoder = codecs.getincrementaldecoder(encoding)(errors='replace')
+    buffer = io.StringIO()
+    total_bytes = 0
+
+    while True:
+        chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+
+        total_bytes += len(chunk)
+        if total_bytes > MAX_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail="File too large (max 5MB)"
+            )
+
+        buffer.write(decoder.decode(chunk))
+
+    buffer.write(decoder.decode(b'', final=True))
+    return buffer.getvalue()
+
+
+ANALYSIS_CACHE_SIZE = 256
+
+_analysis_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_analysis_cache_lock = threading.Lock()
+
+
+def analyze_cached(code: str) -> Dict[str, Any]:
+
+    # Keyed by digest so the cache does not keep up to 1MB of source per entry alive
+    key = hashlib.blake2b(code.encode('utf-8', 'surrogatepass'), digest_size=16).hexdigest()
+
+    with _analysis_cache_lock:
+        cached = _analysis_cache.get(key)
+        if cached is not None:
+            _analysis_cache.move_to_end(key)
+
+    # Callers get their own copy, so mutating a result never touches the cached entry
+    if cached is not None:
+        analysis = copy.deepcopy(cached)
+        metadata = analysis.get('analysis_metadata')
+        if metadata is not None:
+            metadata['analysis_timestamp'] = datetime.datetime.now().isoformat()
+        return analysis
+
+    analysis = analyze(code)
+
+    with _analysis_cache_lock:
+        _analysis_cache[key] = copy.deepcopy(analysis)
+        if len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+
+    return analysis
+
+
 def handle_parser_error(error: Exception) -> HTTPException:
 
     if isinstance(error, FileTooLargeError):
@@ -213,6 +293,23 @@ def handle_parser_error(error: Exception) -> HTTPException:
         )
 
 
+def log_analysis_result(filename: str, analysis_result: AnalysisResult, language: str) -> None:
+
+    # Runs as a background task after the response is sent; failures must not propagate
+    try:
+        db = get_database()
+        db.log_analysis(
+            filename=filename,
+            result=analysis_result.result,
+            score=int(analysis_result.confidence),
+            language=language,
+            patterns=analysis_result.patterns_found,
+            analysis_data=analysis_result.analysis_details
+        )
+    except Exception as e:
+        logger.warning(f"Failed to log analysis to database: {e}")
+
+
 @app.get("/api/health", response_model=HealthResponse)
 async def health_check():
 
@@ -236,27 +333,30 @@ async def health_check():
 
 
 @app.post("/api/check", response_model=AnalysisResult)
-async def analyze_code_text(request: CodeAnalysisRequest):
+async def analyze_code_text(request: CodeAnalysisRequest, background_tasks: BackgroundTasks):
 
     try:
         logger.info(f"Analyzing code text (length: {len(request.code)} chars)")
 
-    # Parse the code text
-        parsed_results = parse(request.code)
+        if request.language != "auto":
+            # Caller supplied the language, so parse() has nothing to add
+            validate_string_input(request.code)
+            content = request.code
+            final_language = request.language
+        else:
+            parsed_results = await asyncio.to_thread(parse, request.code)
 
-        if not parsed_results:
-            raise HTTPException(
-                status_code=400,
-                detail="No valid code content found in input"
-            )
-
-        result = parsed_results[0]
-        content = result['content']
-        detected_language = result['language']
+            if not parsed_results:
+                raise HTTPException(
+                    status_code=400,
+                    detail="No valid code content found in input"
+                )
 
-        final_language = request.language if request.language != "auto" else detected_language
+            result = parsed_results[0]
+            content = result['content']
+            final_language = result['language']
 
-        analysis = analyze(content)
+        analysis = await asyncio.to_thread(analyze_cached, content)
 
         analysis_result = format_analysis_result(
             analysis, 
@@ -264,18 +364,12 @@ async def analyze_code_text(request: CodeAnalysisRequest):
             final_language
         )
 
-        try:
-            db = get_database()
-            db.log_analysis(
-                filename="text_input",
-                result=analysis_result.result,
-                score=int(analysis_result.confidence),
-                language=final_language,
-                patterns=analysis_result.patterns_found,
-                analysis_data=analysis_result.analysis_details
-            )
-        except Exception as e:
-            logger.warning(f"Failed to log analysis to database: {e}")
+        background_tasks.add_task(
+            log_analysis_result,
+            "text_input",
+            analysis_result,
+            final_language
+        )
 
         logger.info(f"Analysis completed: {analysis_result.result} ({analysis_result.confidence}%)")
         return analysis_result
@@ -295,7 +389,7 @@ async def analyze_code_text(request: CodeAnalysisRequest):
 
 
 @app.post("/api/analyze", response_model=AnalysisResult)
-async def analyze_uploaded_file(file: UploadFile = File(...)):
+async def analyze_uploaded_file(background_tasks: BackgroundTasks, file: UploadFile = File(...)):
 
     try:
         logger.info(f"Analyzing uploaded file: {file.filename}")
@@ -306,27 +400,10 @@ async def analyze_uploaded_file(file: UploadFile = File(...)):
                 detail="No filename provided"
             )
 
-        content = await file.read()
-
-        try:
-            text_content = content.decode('utf-8')
-        except UnicodeDecodeError:
-            try:
-                text_content = content.decode('latin-1')
-            except UnicodeDecodeError:
-                raise HTTPException(
-                    status_code=400,
-                    detail="File encoding not supported. Please use UTF-8 or Latin-1."
-                )
-
-        if len(text_content) > 5_000_000:
-            raise HTTPException(
-                status_code=413,
-                detail="File too large (max 5MB)"
-            )
+        text_content = await read_upload_text(file)
 
     # Parse the file content
-        parsed_results = parse(text_content)
+        parsed_results = await asyncio.to_thread(parse, text_content)
 
         if not parsed_results:
             raise HTTPException(
@@ -338,7 +415,7 @@ async def analyze_uploaded_file(file: UploadFile = File(...)):
         content = result['content']
         detected_language = result['language']
 
-        analysis = analyze(content)
+        analysis = await asyncio.to_thread(analyze_cached, content)
 
         analysis_result = format_analysis_result(
             analysis, 
@@ -346,18 +423,12 @@ async def analyze_uploaded_file(file: UploadFile = File(...)):
             detected_language
         )
 
-        try:
-            db = get_database()
-            db.log_analysis(
-                filename=file.filename,
-                result=analysis_result.result,
-                score=int(analysis_result.confidence),
-                language=detected_language,
-                patterns=analysis_result.patterns_found,
-                analysis_data=analysis_result.analysis_details
-            )
-        except Exception as e:
-            logger.warning(f"Failed to log analysis to database: {e}")
+        background_tasks.add_task(
+            log_analysis_result,
+            file.filename,
+            analysis_result,
+            detected_language
+        )
 
         logger.info(f"File analysis completed: {analysis_result.result} ({analysis_result.confidence}%)")
         return analysis_result
@@ -374,38 +445,54 @@ async def analyze_uploaded_file(file: UploadFile = File(...)):
         )
 
 
-@app.get("/api/quiz/questions", response_model=List[QuizQuestion])
-async def get_quiz_questions():
+QUIZ_PATH = Path(__file__).parent / "data" / "quiz_questions.json"
 
-    try:
-        import json
-        import os
 
-        quiz_file_path = os.path.join("data", "quiz_questions.json")
+@lru_cache(maxsize=1)
+def _load_quiz_data() -> Dict[str, Any]:
 
-        if not os.path.exists(quiz_file_path):
-            raise HTTPException(
-                status_code=404,
-                detail="Quiz questions file not found"
-            )
+    raw = QUIZ_PATH.read_bytes()
 
-        with open(quiz_file_path, 'r', encoding='utf-8') as f:
-            quiz_data = json.load(f)
-
-        questions = []
-        for q in quiz_data['quiz_questions']:
-            question = QuizQuestion(
-                id=q['id'],
-                question=q['question'],
-                code=q['code'],
-                language=q['language'],
-                patterns=q['patterns']
-            )
-            questions.append(question)
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@lru_cache(maxsize=1)
+def _load_quiz_questions() -> List[QuizQuestion]:
+
+    return [
+        QuizQuestion(
+            id=q['id'],
+            question=q['question'],
+            code=q['code'],
+            language=q['language'],
+            patterns=q['patterns']
+        )
+        for q in _load_quiz_data()['quiz_questions']
+    ]
+
+
+@lru_cache(maxsize=1)
+def _load_quiz_index() -> Dict[int, Dict[str, Any]]:
+
+    return {q['id']: q for q in _load_quiz_data()['quiz_questions']}
+
+
+@app.get("/api/quiz/questions", response_model=List[QuizQuestion])
+async def get_quiz_questions():
+
+    try:
+        questions = _load_quiz_questions()
 
         logger.info(f"Served {len(questions)} quiz questions")
         return questions
 
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=404,
+            detail="Quiz questions file not found"
+        )
     except Exception as e:
         logger.error(f"Error loading quiz questions: {e}")
         raise HTTPException(
@@ -418,25 +505,15 @@ async def get_quiz_questions():
 async def submit_quiz_answer(answer: QuizAnswer):
 
     try:
-        import json
-        import os
-
-        quiz_file_path = os.path.join("data", "quiz_questions.json")
-
-        if not os.path.exists(quiz_file_path):
+        try:
+            quiz_index = _load_quiz_index()
+        except FileNotFoundError:
             raise HTTPException(
                 status_code=404,
                 detail="Quiz questions file not found"
             )
 
-        with open(quiz_file_path, 'r', encoding='utf-8') as f:
-            quiz_data = json.load(f)
-
-        question_data = None
-        for q in quiz_data['quiz_questions']:
-            if q['id'] == answer.question_id:
-                question_data = q
-                break
+        question_data = quiz_index.get(answer.question_id)
 
         if not question_data:
             raise HTTPException(
@@ -1,97 +1,135 @@
 #!/usr/bin/env python3
+import io
 import re
 import os
-import glob
+from concurrent.futures import ThreadPoolExecutor
+
+_TRIPLE_DQ = re.compile(r'""".*?"""', re.DOTALL)
+_TRIPLE_SQ = re.compile(r"'''.*?'''", re.DOTALL)
+
+# Longest run of newlines kept in the output (two blank lines)
+_MAX_NEWLINES = 3
+
+# Keywords that mark a comment as worth keeping, matched in one case-insensitive pass
+_KEEP_RE = re.compile(r'todo|fixme|hack|note|important|warning', re.IGNORECASE)
+_EXPLAIN_RE = re.compile(r'check|parse|analyze|calculate|extract', re.IGNORECASE)
+_INLINE_KEEP_RE = re.compile(r'todo|fixme|important|production', re.IGNORECASE)
+
+def _iter_lines(content):
+    """Yield lines split on '\\n' only, like str.split('\\n') but lazily."""
+    start = 0
+    while True:
+        end = content.find('\n', start)
+        if end == -1:
+            yield content[start:]
+            return
+        yield content[start:end]
+        start = end + 1
 
 def clean_docstrings_and_comments(content):
     """Remove verbose docstrings and comments, keep only essential ones."""
-    
+
     # Remove triple-quoted docstrings
-    content = re.sub(r'""".*?"""', '', content, flags=re.DOTALL)
-    content = re.sub(r"'''.*?'''", '', content, flags=re.DOTALL)
-    
-    # Split into lines for processing
-    lines = content.split('\n')
-    cleaned_lines = []
+    content = _TRIPLE_DQ.sub('', content)
+    content = _TRIPLE_SQ.sub('', content)
+
+    # Stream lines into one output buffer; newline runs are capped as we go
+    out = io.StringIO()
+    pending_newlines = -1
     
-    for line in lines:
+    for line in _iter_lines(content):
+        stripped = line.strip()
+
         # Skip empty lines with only whitespace
-        if not line.strip():
-            cleaned_lines.append('')
+        if not stripped:
+            pending_newlines += 1
             continue
-            
+
         # Keep important comments (short and essential)
-        if line.strip().startswith('#'):
-            comment = line.strip()[1:].strip()
+        if stripped.startswith('#'):
+            comment = stripped[1:].strip()
             # Keep short, useful comments
-            if (len(comment) < 50 and 
-                any(keyword in comment.lower() for keyword in 
-                    ['todo', 'fixme', 'hack', 'note', 'important', 'warning'])):
-                cleaned_lines.append(line)
+            if len(comment) < 50 and _KEEP_RE.search(comment):
+                line_out = line
             # Keep simple inline explanations
-            elif (len(comment) < 30 and 
-                  any(keyword in comment.lower() for keyword in 
-                      ['check', 'parse', 'analyze', 'calculate', 'extract'])):
-                cleaned_lines.append(f"    # {comment}")
-            continue
-            
+            elif len(comment) < 30 and _EXPLAIN_RE.search(comment):
+                line_out = f"    # {comment}"
+            else:
+                continue
+
         # Handle inline comments
-        if '#' in line and not line.strip().startswith('#'):
+        elif '#' in line:
             code_part, comment_part = line.split('#', 1)
             comment = comment_part.strip()
             # Keep short, useful inline comments
-            if (len(comment) < 30 and 
-                any(keyword in comment.lower() for keyword in 
-                    ['todo', 'fixme', 'important', 'production'])):
-                cleaned_lines.append(f"{code_part.rstrip()} # {comment}")
+            if len(comment) < 30 and _INLINE_KEEP_RE.search(comment):
+                line_out = f"{code_part.rstrip()} # {comment}"
             else:
-                cleaned_lines.append(code_part.rstrip())
+                line_out = code_part.rstrip()
         else:
-            cleaned_lines.append(line)
-    
-    # Join lines and clean up extra whitespace
-    result = '\n'.join(cleaned_lines)
-    
-    # Remove excessive empty lines (more than 2 consecutive)
-    result = re.sub(r'\n\s*\n\s*\n\s*\n+', '\n\n\n', result)
+            line_out = line
+
+        # Remove excessive empty lines (more than 2 consecutive)
+        out.write('\n' * min(pending_newlines + 1, _MAX_NEWLINES))
+        out.write(line_out)
+        pending_newlines = 0
     
-    return result
+    out.write('\n' * min(pending_newlines, _MAX_NEWLINES))
+    return out.getvalue()
+
+_IO_BUFFER_SIZE = 1 << 20
+MAX_FILE_CHARS = 5 * 1024 * 1024
 
 def process_file(filepath):
     """Process a single Python file."""
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
+        with open(filepath, 'r', encoding='utf-8', buffering=_IO_BUFFER_SIZE) as f:
+            # Read one char past the limit so oversized files are detected without a stat()
+            content = f.read(MAX_FILE_CHARS + 1)
+
+        if len(content) > MAX_FILE_CHARS:
+            print(f"Skipped (too large): {filepath}")
+            return
+
         cleaned = clean_docstrings_and_comments(content)
-        
-        with open(filepath, 'w', encoding='utf-8') as f:
+
+        with open(filepath, 'w', encoding='utf-8', buffering=_IO_BUFFER_SIZE) as f:
             f.write(cleaned)
-        
+
         print(f"Cleaned: {filepath}")
     except Exception as e:
         print(f"Error processing {filepath}: {e}")
 
+SOURCE_DIRS = ('shadow_ai', 'tests', 'scripts')
+
+def iter_python_files(directories):
+    """Yield .py files directly inside each directory, skipping this script."""
+    for directory in directories:
+        try:
+            entries = os.scandir(directory)
+        except FileNotFoundError:
+            continue
+        with entries:
+            for entry in entries:
+                # scandir carries the file type from the dirent, so no extra stat() per file
+                if (entry.name.endswith('.py') and entry.name != 'clean_code.py' and
+                        entry.is_file(follow_symlinks=False)):
+                    yield entry.path
+
 def main():
     """Clean all Python files in the project."""
     # Get all Python files
-    python_files = []
-    
-    # Main source files
-    python_files.extend(glob.glob('shadow_ai/*.py'))
-    python_files.extend(glob.glob('tests/*.py'))
-    python_files.extend(glob.glob('scripts/*.py'))
-    python_files.append('main.py')
-    
-    # Filter out this script itself
-    python_files = [f for f in python_files if 'clean_code.py' not in f]
+    python_files = list(iter_python_files(SOURCE_DIRS))
+    if os.path.isfile('main.py'):
+        python_files.append('main.py')
     
     print(f"Found {len(python_files)} Python files to clean")
     
-    for filepath in python_files:
-        if os.path.exists(filepath):
-            process_file(filepath)
-    
+    # Files are independent and the work is mostly I/O, so overlap them on threads
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(process_file, python_files))
+
     print("Cleanup complete!")
 
 if __name__ == "__main__":
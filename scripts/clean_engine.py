@@ -1,6 +1,46 @@
 #!/usr/bin/env python3
 import ast
-import os
+import re
+
+_DOCSTRING_OWNERS = (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)
+
+# Keywords that mark a comment as worth keeping, matched in one case-insensitive pass
+_KEEP_RE = re.compile(r'analyze|check|calculate|extract|parse|todo|fixme|important|note', re.IGNORECASE)
+_INLINE_KEEP_RE = re.compile(r'todo|fixme|important|production|note', re.IGNORECASE)
+
+
+def _docstring_spans(tree):
+    """Yield (start, end, indent, only_statement) for every docstring in the tree."""
+    for node in ast.walk(tree):
+        if not isinstance(node, _DOCSTRING_OWNERS) or not node.body:
+            continue
+
+        first = node.body[0]
+        if not (isinstance(first, ast.Expr) and
+                isinstance(first.value, ast.Constant) and
+                isinstance(first.value.value, str)):
+            continue
+
+        # Leave one-line bodies like `def f(): """doc"""` alone, the line also holds code
+        if first.lineno == getattr(node, 'lineno', None):
+            continue
+        if len(node.body) > 1 and node.body[1].lineno == first.end_lineno:
+            continue
+
+        yield first.lineno - 1, first.end_lineno, first.col_offset, len(node.body) == 1
+
+
+def strip_docstrings(content):
+    """Remove module, class and function docstrings, keeping the rest of the source intact."""
+    lines = content.split('\n')
+    tree = ast.parse(content)
+
+    # Splice from the bottom up so earlier line numbers stay valid
+    for start, end, indent, only_statement in sorted(_docstring_spans(tree), reverse=True):
+        lines[start:end] = [' ' * indent + 'pass'] if only_statement else []
+
+    return lines
+
 
 def clean_engine_file():
     """Manually clean the engine.py file with careful preservation of code."""
@@ -10,94 +50,34 @@ def clean_engine_file():
     with open(file_path, 'r', encoding='utf-8') as f:
         content = f.read()
     
-    # Remove module docstring at the top
-    lines = content.split('\n')
     cleaned_lines = []
-    in_module_docstring = False
-    skip_until_import = False
     
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        
-        # Skip module docstring at the beginning
-        if i < 20 and '"""' in line and not skip_until_import:
-            if line.count('"""') == 2:  # Single line docstring
-                skip_until_import = True
-                i += 1
-                continue
-            elif line.count('"""') == 1:  # Start of multi-line docstring
-                in_module_docstring = True
-                i += 1
-                continue
-        
-        if in_module_docstring:
-            if '"""' in line:
-                in_module_docstring = False
-                skip_until_import = True
-            i += 1
-            continue
-        
-        # Skip function/class docstrings
-        if ('def ' in line or 'class ' in line) and i + 1 < len(lines):
-            cleaned_lines.append(line)
-            i += 1
-            # Check if next non-empty line is a docstring
-            while i < len(lines):
-                next_line = lines[i].strip()
-                if not next_line:
-                    cleaned_lines.append(lines[i])
-                    i += 1
-                    continue
-                elif next_line.startswith('"""') or next_line.startswith("'''"):
-                    # Skip the docstring
-                    if next_line.count('"""') == 2 or next_line.count("'''") == 2:
-                        # Single line docstring
-                        i += 1
-                        break
-                    else:
-                        # Multi-line docstring
-                        quote_type = '"""' if '"""' in next_line else "'''"
-                        i += 1
-                        while i < len(lines) and quote_type not in lines[i]:
-                            i += 1
-                        i += 1  # Skip the closing quotes
-                        break
-                else:
-                    break
-            continue
-        
+    for line in strip_docstrings(content):
         # Keep essential comments, remove verbose ones
-        if line.strip().startswith('#'):
-            comment = line.strip()[1:].strip()
+        stripped = line.strip()
+        if stripped.startswith('#'):
+            comment = stripped[1:].strip()
             # Keep short, useful comments
-            if (len(comment) < 50 and 
-                any(keyword in comment.lower() for keyword in 
-                    ['analyze', 'check', 'calculate', 'extract', 'parse', 'todo', 'fixme', 'important', 'note'])):
+            if len(comment) < 50 and _KEEP_RE.search(comment):
                 cleaned_lines.append(f"    # {comment}")
             # Skip verbose explanatory comments
         else:
             # Handle inline comments
-            if '#' in line and not line.strip().startswith('#'):
+            if '#' in line:
                 code_part, comment_part = line.split('#', 1)
                 comment = comment_part.strip()
                 # Keep short, useful inline comments
-                if (len(comment) < 30 and 
-                    any(keyword in comment.lower() for keyword in 
-                        ['todo', 'fixme', 'important', 'production', 'note'])):
+                if len(comment) < 30 and _INLINE_KEEP_RE.search(comment):
                     cleaned_lines.append(f"{code_part.rstrip()} # {comment}")
                 else:
                     cleaned_lines.append(code_part.rstrip())
             else:
                 cleaned_lines.append(line)
-        
-        i += 1
     
     # Join and clean up
     result = '\n'.join(cleaned_lines)
     
     # Remove excessive empty lines
-    import re
     result = re.sub(r'\n\s*\n\s*\n\s*\n+', '\n\n', result)
     
     # Write back
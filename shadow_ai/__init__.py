@@ -4,6 +4,25 @@ __version__ = "0.1.0"
 __author__ = "Your Name"
 __email__ = "your.email@example.com"
 
-from .engine import analyze
-from .parser import parse
-from .cli import main as cli_main
+import importlib
+from typing import Any
+
+__all__ = ['analyze', 'parse', 'cli_main']
+
+# Public names resolved on first access (PEP 562) so importing the package stays cheap
+_LAZY_ATTRS = {
+    'analyze': ('.engine', 'analyze'),
+    'parse': ('.parser', 'parse'),
+    'cli_main': ('.cli', 'main'),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attr_name = _LAZY_ATTRS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module_name, __name__), attr_name)
+    globals()[name] = value
+    return value
@@ -1,24 +1,50 @@
 
 
 import argparse
+import collections
+import functools
+import hashlib
+import itertools
+import json
+import os
+import queue
 import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, Iterable, Iterator, List, Optional, TextIO
 
-from .engine import analyze
-from .parser import parse, ParserError, InvalidInputError, FileTooLargeError
+from . import __version__
 
+# The engine and parser are imported inside the functions that use them, so that
+# building the parser and printing help stay cheap
 
-def format_analysis_results(results: List[Dict[str, Any]]) -> str:
+# Number of files read ahead of the analysis step during a scan
+SCAN_PREFETCH = 8
 
-    if not results:
-        return "No results to display."
+# Per-user on-disk cache of analysis results used by --cache, keyed by content hash
+CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'shadow_ai'
+
+# Most results kept in CACHE_DIR; the oldest are removed once this is exceeded
+CACHE_MAX_ENTRIES = 1000
+
+# Distinctive AI phrases, in lowercase; --quick skips files that contain none of them
+QUICK_MARKERS = (
+    'as an ai', 'language model', 'chatgpt', 'copilot', "here's an example",
+    'here is an example', 'hope this helps', 'feel free to', 'let me know if',
+    'knowledge cutoff', 'as of my last',
+)
 
-    output_lines = []
+
+def iter_analysis_lines(results: List[Dict[str, Any]]) -> Iterator[str]:
+
+    if not results:
+        yield "No results to display."
+        return
 
     for i, result in enumerate(results):
         if len(results) > 1:
-            output_lines.append(f"\n=== File {i+1}: {result.get('source', 'Unknown')} ===")
+            yield f"\n=== File {i+1}: {result.get('source', 'Unknown')} ==="
 
         analysis = result.get('analysis', {})
 
@@ -37,33 +63,47 @@ def format_analysis_results(results: List[Dict[str, Any]]) -> str:
             risk_level = "LOW"
             result_verdict = "Likely Human-Written"
 
-        output_lines.append(f"Source: {result.get('source', 'Unknown')}")
-        output_lines.append(f"Language: {result.get('language', 'Unknown')}")
-        output_lines.append(f"Result: {result_verdict}")
-        output_lines.append(f"Confidence: {suspicion_score:.1f}%")
+        yield f"Source: {result.get('source', 'Unknown')}"
+        yield f"Language: {result.get('language', 'Unknown')}"
+        yield f"Result: {result_verdict}"
+        yield f"Confidence: {suspicion_score:.1f}%"
 
         if risk_factors:
             primary_reasons = risk_factors[:2]
             reason = ", ".join(primary_reasons)
-            output_lines.append(f"Reason: {reason}")
+            yield f"Reason: {reason}"
 
             patterns_list = [factor.split('(')[0].strip() for factor in risk_factors]
             patterns_str = "[" + ", ".join(patterns_list) + "]"
-            output_lines.append(f"Patterns Found: {patterns_str}")
+            yield f"Patterns Found: {patterns_str}"
         else:
-            output_lines.append("Reason: No significant AI patterns detected")
-            output_lines.append("Patterns Found: []")
+            yield "Reason: No significant AI patterns detected"
+            yield "Patterns Found: []"
 
         metadata = analysis.get('analysis_metadata', {})
         if metadata.get('errors_encountered'):
-            output_lines.append("Warnings:")
+            yield "Warnings:"
             for error in metadata['errors_encountered']:
-                output_lines.append(f"  - {error}")
+                yield f"  - {error}"
+
+
+def format_analysis_results(results: List[Dict[str, Any]]) -> str:
+
+    return "\n".join(iter_analysis_lines(results))
+
+
+def write_analysis_results(results: List[Dict[str, Any]], stream: Optional[TextIO] = None) -> None:
 
-    return "\n".join(output_lines)
+    # Stream lines straight to the output instead of building one large string
+    if stream is None:
+        stream = sys.stdout
+    stream.writelines(f"{line}\n" for line in iter_analysis_lines(results))
 
 
-def analyze_single_file(file_path: str) -> int:
+def analyze_single_file(file_path: str, cache: bool = False) -> int:
+
+    from .engine import analyze
+    from .parser import parse, FileTooLargeError
 
     try:
     # Parse the file
@@ -72,11 +112,12 @@ def analyze_single_file(file_path: str) -> int:
     # Analyze each result
         for result in parsed_results:
             content = result['content']
-            analysis = analyze(content)
+            analysis = analyze_cached(content) if cache else analyze(content)
             result['analysis'] = analysis
 
-        output = format_analysis_results(parsed_results)
-        print(output)
+        if cache:
+            prune_cache()
+        write_analysis_results(parsed_results)
 
         return 0
 
@@ -96,6 +137,9 @@ def analyze_single_file(file_path: str) -> int:
 
 def check_text_string(text: str) -> int:
 
+    from .engine import analyze
+    from .parser import parse, InvalidInputError
+
     try:
     # Parse the text string
         parsed_results = parse(text)
@@ -106,8 +150,7 @@ def check_text_string(text: str) -> int:
             analysis = analyze(content)
             result['analysis'] = analysis
 
-        output = format_analysis_results(parsed_results)
-        print(output)
+        write_analysis_results(parsed_results)
 
         return 0
 
@@ -119,29 +162,195 @@ def check_text_string(text: str) -> int:
         return 1
 
 
-def scan_directory(directory_path: str, max_files: int = 5, recursive: bool = False) -> int:
+def iter_prefetched(items: Iterable[Any], depth: int = SCAN_PREFETCH) -> Iterator[Any]:
+
+    # Read ahead on a background thread so file I/O overlaps with analysis
+    buffer = queue.Queue(maxsize=depth)
+    done = object()
+
+    def produce():
+        try:
+            for item in items:
+                buffer.put((item, None))
+        except BaseException as e:
+            buffer.put((None, e))
+        buffer.put((done, None))
+
+    threading.Thread(target=produce, daemon=True).start()
+
+    while True:
+        item, error = buffer.get()
+        if error is not None:
+            raise error
+        if item is done:
+            return
+        yield item
+
+
+@functools.lru_cache(maxsize=1)
+def engine_fingerprint() -> bytes:
+
+    from . import engine, scoring
+
+    # Changes whenever the version or the heuristics change, so stale results are never reused
+    digest = hashlib.blake2b(__version__.encode('utf-8'), digest_size=16)
+    for module in (engine, scoring):
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.digest()
+
+
+def prune_cache() -> None:
+    # Called once per command; a concurrent prune in another process may remove
+    # entries between listing and stat, so those are skipped
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            entries = [entry for entry in it if entry.name.endswith('.json')]
+    except OSError:
+        return
+    if len(entries) <= CACHE_MAX_ENTRIES:
+        return
+
+    aged = []
+    for entry in entries:
+        try:
+            aged.append((entry.stat().st_mtime, entry.path))
+        except OSError:
+            continue
+    aged.sort()
+    for _, path in aged[:len(aged) - CACHE_MAX_ENTRIES]:
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def analyze_cached(content: str) -> Dict[str, Any]:
+
+    from .engine import analyze
+
+    # Keyed by engine and content, so an edited file or an upgraded engine misses the cache
+    digest = hashlib.blake2b(engine_fingerprint(), digest_size=16)
+    digest.update(content.encode('utf-8', 'surrogatepass'))
+    key = digest.hexdigest()
+    cache_path = CACHE_DIR / f"{key}.json"
+    try:
+        return json.loads(cache_path.read_bytes())
+    except (OSError, ValueError):
+        pass
+
+    analysis = analyze(content)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write then rename so concurrent workers never read a partial file
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(analysis), encoding='utf-8')
+        os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        pass
+    return analysis
+
+
+def has_quick_markers(content: str) -> bool:
+
+    lowered = content.lower()
+    return any(marker in lowered for marker in QUICK_MARKERS)
+
+
+def quick_reject_result(content: str) -> Dict[str, Any]:
+
+    # Same shape as the summary/metadata parts of analyze() output
+    return {
+        'summary': {
+            'total_indicators': 0,
+            'risk_factors': [],
+            'overall_suspicion_score': 0.0
+        },
+        'analysis_metadata': {
+            'code_length': len(content),
+            'analysis_timestamp': None,
+            'heuristics_run': 0,
+            'errors_encountered': [],
+            'quick_rejected': True
+        }
+    }
+
+
+def iter_analyzed(
+    parsed: Iterable[Dict[str, Any]], jobs: Optional[int] = None, quick: bool = False,
+    cache: bool = False
+) -> Iterator[Dict[str, Any]]:
+
+    from .engine import analyze
+
+    # Content is dropped once analyzed so only in-flight files stay in memory
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+    analyzer = analyze_cached if cache else analyze
+
+    # A single file is not worth starting worker processes for
+    parsed = iter(parsed)
+    head = list(itertools.islice(parsed, 2))
+    parsed = itertools.chain(head, parsed)
+
+    if jobs <= 1 or len(head) < 2:
+        for result in parsed:
+            content = result.pop('content')
+            if quick and content and not has_quick_markers(content):
+                result['analysis'] = quick_reject_result(content)
+            else:
+                result['analysis'] = analyzer(content)
+            yield result
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = collections.deque()
+        for result in parsed:
+            content = result.pop('content')
+            if quick and content and not has_quick_markers(content):
+                result['analysis'] = quick_reject_result(content)
+                pending.append((result, None))
+            else:
+                pending.append((result, executor.submit(analyzer, content)))
+            if len(pending) >= jobs * 2:
+                result, future = pending.popleft()
+                if future is not None:
+                    result['analysis'] = future.result()
+                yield result
+
+        while pending:
+            result, future = pending.popleft()
+            if future is not None:
+                result['analysis'] = future.result()
+            yield result
+
+
+def scan_directory(
+    directory_path: str, max_files: int = 5, recursive: bool = False, jobs: Optional[int] = None,
+    quick: bool = False, cache: bool = False
+) -> int:
+
+    from .parser import iter_parse_directory
 
     if recursive:
         print("Warning: Recursive scanning not yet implemented. Scanning top level only.")
 
+    if jobs is None:
+        jobs = os.cpu_count() or 1
+
     try:
-    # Parse the directory
-        parsed_results = parse(directory_path, max_files=max_files)
+    # Read files on a background thread while earlier ones are analyzed
+        parsed = iter_prefetched(iter_parse_directory(directory_path, max_files=max_files))
+        analyzed_results = list(iter_analyzed(parsed, jobs=min(jobs, max_files), quick=quick, cache=cache))
+        if cache:
+            prune_cache()
 
-        if not parsed_results:
+        if not analyzed_results:
             print(f"No code files found in directory: {directory_path}")
             return 0
 
-        print(f"Found {len(parsed_results)} code files to analyze...")
-
-    # Analyze each result
-        for result in parsed_results:
-            content = result['content']
-            analysis = analyze(content)
-            result['analysis'] = analysis
+        print(f"Found {len(analyzed_results)} code files to analyze...")
 
-        output = format_analysis_results(parsed_results)
-        print(output)
+        write_analysis_results(analyzed_results)
 
         return 0
 
@@ -156,6 +365,7 @@ def scan_directory(directory_path: str, max_files: int = 5, recursive: bool = Fa
         return 1
 
 
+@functools.lru_cache(maxsize=1)
 def create_parser() -> argparse.ArgumentParser:
 
     parser = argparse.ArgumentParser(
@@ -175,6 +385,11 @@ def create_parser() -> argparse.ArgumentParser:
         'file',
         help='Path to the file to analyze'
     )
+    analyze_parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Reuse analysis results stored on disk (bounded, in ~/.cache/shadow_ai)'
+    )
 
     # Check command - raw text
     check_parser = subparsers.add_parser(
@@ -206,6 +421,22 @@ def create_parser() -> argparse.ArgumentParser:
         action='store_true',
         help='Scan subdirectories recursively (not yet implemented)'
     )
+    scan_parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Number of worker processes for analysis (default: CPU count)'
+    )
+    scan_parser.add_argument(
+        '--quick',
+        action='store_true',
+        help='Skip full analysis for files containing none of the distinctive AI phrases'
+    )
+    scan_parser.add_argument(
+        '--cache',
+        action='store_true',
+        help='Reuse analysis results stored on disk (bounded, in ~/.cache/shadow_ai)'
+    )
 
     return parser
 
@@ -221,14 +452,17 @@ def main() -> int:
 
     try:
         if args.command == 'analyze':
-            return analyze_single_file(args.file)
+            return analyze_single_file(args.file, cache=args.cache)
         elif args.command == 'check':
             return check_text_string(args.text)
         elif args.command == 'scan':
             return scan_directory(
                 args.directory, 
                 max_files=args.max_files,
-                recursive=args.recursive
+                recursive=args.recursive,
+                jobs=args.jobs,
+                quick=args.quick,
+                cache=args.cache
             )
         else:
             print(f"Unknown command: {args.command}", file=sys.stderr)
@@ -1,66 +1,353 @@
 # Shadow AI Detection Engine - Core heuristic analysis
 import re
 import ast
-from typing import Dict, List, Any, Union
+import datetime
+import functools
+from collections import Counter, deque
+from types import MappingProxyType
+from typing import Dict, List, Any, Mapping, Optional, Sequence, Union
 from .scoring import ConfidenceScorer
 
 
+# Patterns that indicate generic, AI-generated comments
+# These patterns look for overly simple, templated comment structures
+_GENERIC_COMMENT_PATTERNS = tuple(re.compile(p, re.IGNORECASE) for p in [
+    r'#\s*Function\s+(to\s+)?\w+(\s+\w+){0,2}\s*$',     # "# Function to calculate sum" (short and generic)
+    r'#\s*Variable\s+(to\s+)?\w+(\s+\w+){0,2}\s*$',     # "# Variable to store result" (short and generic)
+    r'#\s*Initialize\s+\w+(\s+\w+){0,1}\s*$',           # "# Initialize variable" (short and generic)
+    r'#\s*Create\s+(a\s+)?\w+(\s+\w+){0,1}\s*$',        # "# Create a list" (short and generic)
+    r'#\s*Set\s+(the\s+)?\w+(\s+\w+){0,1}\s*$',         # "# Set the value" (short and generic)
+    r'#\s*Define\s+(a\s+)?\w+(\s+\w+){0,1}\s*$',        # "# Define a function" (short and generic)
+    r'#\s*Calculate\s+(the\s+)?\w+(\s+\w+){0,1}\s*$',   # "# Calculate the result" (short and generic)
+    r'#\s*Process\s+(the\s+)?\w+(\s+\w+){0,1}\s*$',     # "# Process the data" (short and generic)
+    r'#\s*Return\s+(the\s+)?\w+(\s+\w+){0,1}\s*$',      # "# Return the result" (short and generic)
+    r'#\s*Check\s+(if\s+)?\w+(\s+\w+){0,1}\s*$',        # "# Check if condition" (short and generic)
+    r'#\s*TODO:?\s*[A-Z][a-z]+(\s+\w+){0,1}\s*$',       # "# TODO: Implement" (short and generic)
+    r'#\s*[A-Z][a-z]+\s+[a-z]+\s+here\s*$',            # "# Insert code here"
+    r'#\s*Example\s*(code|usage)\s*$',                  # "# Example code"
+    r'#\s*Sample\s*(code|data)\s*$',                    # "# Sample code"
+])
+
+# Lines whose first non-whitespace character is '#' (comments) or anything else (code);
+# [^\S\n] is whitespace other than the newline, matching what str.strip() removes
+_COMMENT_LINE = re.compile(r'^[^\S\n]*(#[^\n]*)', re.MULTILINE)
+_CODE_LINE = re.compile(r'^[^\S\n]*[^#\s]', re.MULTILINE)
+
+# Index the generic comment patterns by the literal word they start with, so a
+# comment is only tested against patterns its first word can satisfy
+_GENERIC_COMMENT_LEADING_WORD = re.compile(r'#\s*([A-Za-z]+)')
+_GENERIC_COMMENT_BY_PREFIX = {}
+_GENERIC_COMMENT_UNPREFIXED = []
+for _pattern in _GENERIC_COMMENT_PATTERNS:
+    _prefix = _GENERIC_COMMENT_LEADING_WORD.match(_pattern.pattern.replace('\\s*', ''))
+    if _prefix:
+        _GENERIC_COMMENT_BY_PREFIX.setdefault(_prefix.group(1).lower(), []).append(_pattern)
+    else:
+        _GENERIC_COMMENT_UNPREFIXED.append(_pattern)
+_GENERIC_COMMENT_PREFIX_LENGTHS = tuple(sorted({len(prefix) for prefix in _GENERIC_COMMENT_BY_PREFIX}))
+del _pattern, _prefix
+
+
+def _is_generic_comment(comment_line: str) -> bool:
+    """
+    Check whether a stripped comment line matches any generic comment pattern.
+    
+    Patterns are looked up by the comment's first word. Prefix (rather than
+    exact) lookup covers patterns like "TODO:?\\s*" that allow no space after
+    the literal. Lines with a second '#' or non-ASCII text, where the regexes
+    could match elsewhere or case-fold differently, check every pattern.
+    
+    Args:
+        comment_line (str): Stripped line starting with '#'
+        
+    Returns:
+        bool: True if the comment looks generic
+    """
+    if not comment_line.isascii() or comment_line.count('#') != 1:
+        return any(pattern.search(comment_line) for pattern in _GENERIC_COMMENT_PATTERNS)
+    
+    leading = _GENERIC_COMMENT_LEADING_WORD.match(comment_line)
+    if leading:
+        word = leading.group(1).lower()
+        for length in _GENERIC_COMMENT_PREFIX_LENGTHS:
+            if length > len(word):
+                break
+            for pattern in _GENERIC_COMMENT_BY_PREFIX.get(word[:length], ()):
+                if pattern.search(comment_line):
+                    return True
+    
+    return any(pattern.search(comment_line) for pattern in _GENERIC_COMMENT_UNPREFIXED)
+
+
+# AI language patterns checked against comment and docstring text. The text is
+# lowercased before matching, so the patterns are lowercase and case-sensitive
+_AI_SELF_REFERENCE_PATTERNS = tuple(re.compile(p) for p in [
+    r'\bas an ai\b',
+    r'\bai language model\b',
+    r'\bai assistant\b',
+    r'\bi am an ai\b',
+    r'\bi\'m an ai\b',
+    r'\bchatgpt\b',
+    r'\bgpt-\d+\b',
+    r'\bclaude\b(?!\s+\w+\s+\w+)',  # Claude but not "Claude Shannon algorithm"
+    r'\bcopilot\b(?!\s+\w+\s+\w+)', # GitHub Copilot but not "autopilot system"
+    r'\bgemini\b(?!\s+\w+\s+\w+)',  # Google Gemini but not "Gemini constellation"
+    r'\blanguage model\b',
+    r'\bneural network\b(?!\s+implementation)',  # AI reference, not implementation
+])
+
+_CONVERSATIONAL_PATTERNS = tuple(re.compile(p) for p in [
+    r'\bhere\'s\s+(?:an?\s+)?example\b',
+    r'\bhere\s+is\s+(?:an?\s+)?example\b',
+    r'\blet me\s+(?:help|show|explain|provide)\b',
+    r'\bi\'ll\s+(?:help|show|explain|provide|create|write)\b',
+    r'\byou\s+can\s+(?:use|try|modify|adapt)\b',
+    r'\bfeel\s+free\s+to\b',
+    r'\bhope\s+this\s+helps\b',
+    r'\blet\s+me\s+know\s+if\b',
+    r'\bif\s+you\s+(?:need|want|have)\b',
+    r'\bplease\s+(?:note|let\s+me\s+know|feel\s+free)\b',
+    r'\bthis\s+(?:should|will|can)\s+(?:help|work|solve)\b',
+    r'\byou\s+(?:might|may|should|could)\s+(?:want|need|consider)\b',
+])
+
+_DISCLAIMER_PATTERNS = tuple(re.compile(p) for p in [
+    r'\bi\s+cannot\s+(?:access|provide|guarantee)\b',
+    r'\bi\s+don\'t\s+have\s+(?:access|real-time|current)\b',
+    r'\breal-time\s+(?:data|information)\b',
+    r'\bcurrent\s+(?:date|time|year)\b(?!\s+implementation)',
+    r'\bup-to-date\s+information\b',
+    r'\bmay\s+(?:vary|change|differ)\s+(?:depending|based)\b',
+    r'\bplease\s+(?:verify|check|confirm|update)\b',
+    r'\bas\s+of\s+my\s+last\s+(?:update|training)\b',
+    r'\bknowledge\s+cutoff\b',
+    r'\btraining\s+data\b',
+    r'\bmay\s+not\s+be\s+(?:accurate|current|up-to-date)\b',
+    r'\bconsult\s+(?:official|latest|current)\s+documentation\b',
+])
+
+_EXAMPLE_TEMPLATE_PATTERNS = tuple(re.compile(p) for p in [
+    r'\bsample\s+(?:code|implementation|usage)\b',
+    r'\bexample\s+(?:code|implementation|usage)\b',
+    r'\bbasic\s+(?:example|template|implementation)\b',
+    r'\bsimple\s+(?:example|template|implementation)\b',
+    r'\btemplate\s+(?:for|code)\b',
+    r'\bplaceholder\s+(?:for|code|text)\b',
+    r'\breplace\s+(?:this|these)\s+(?:with|values)\b',
+    r'\bmodify\s+(?:as|this)\s+(?:needed|per)\b',
+    r'\badjust\s+(?:as|this)\s+(?:needed|required)\b',
+    r'\bcustomize\s+(?:as|this)\s+(?:needed|required)\b',
+])
+
+# Every pattern in a category needs at least one of that category's anchor words to
+# match, so ASCII text without them can skip the category's regexes entirely
+_SELF_REFERENCE_ANCHORS = frozenset({
+    'ai', 'chatgpt', 'gpt', 'claude', 'copilot', 'gemini', 'language', 'neural',
+})
+_CONVERSATIONAL_ANCHORS = frozenset({
+    'example', 'let', 'll', 'can', 'free', 'hope', 'you', 'please', 'should', 'will',
+})
+_DISCLAIMER_ANCHORS = frozenset({
+    'cannot', 'don', 'real', 'current', 'information', 'may', 'please', 'last',
+    'knowledge', 'training', 'consult',
+})
+_EXAMPLE_TEMPLATE_ANCHORS = frozenset({
+    'sample', 'example', 'basic', 'simple', 'template', 'placeholder', 'replace',
+    'modify', 'adjust', 'customize',
+})
+_AI_LANGUAGE_ANCHOR_WORDS = (
+    _SELF_REFERENCE_ANCHORS | _CONVERSATIONAL_ANCHORS |
+    _DISCLAIMER_ANCHORS | _EXAMPLE_TEMPLATE_ANCHORS
+)
+_ASCII_WORD = re.compile(r'[a-z]+')
+
+# Union of every AI language pattern: one scan tells whether any of them can match
+_ANY_AI_LANGUAGE_PATTERN = re.compile(
+    '|'.join(
+        f'(?:{pattern.pattern})'
+        for patterns in (
+            _AI_SELF_REFERENCE_PATTERNS, _CONVERSATIONAL_PATTERNS,
+            _DISCLAIMER_PATTERNS, _EXAMPLE_TEMPLATE_PATTERNS,
+        )
+        for pattern in patterns
+    )
+)
+
+
+# ast.Match only exists on Python 3.10+
+_CONTROL_FLOW_NODES = tuple(
+    node for node in (ast.If, ast.For, ast.While, ast.Try, ast.With, getattr(ast, 'Match', None))
+    if node is not None
+)
+_CODE_BLOCK_NODES = (ast.FunctionDef, ast.ClassDef, ast.AsyncFunctionDef)
+_DOCSTRING_OWNER_NODES = (ast.FunctionDef, ast.ClassDef, ast.AsyncFunctionDef, ast.Module)
+
+# Node types that increase nesting depth
+_NESTING_NODES = (
+    ast.If, ast.For, ast.While, ast.With, ast.Try, ast.ExceptHandler,
+    ast.FunctionDef, ast.ClassDef, ast.AsyncWith, ast.AsyncFor
+)
+
+
+def _walk_tree(tree: ast.AST) -> Dict[str, Any]:
+    """
+    Collect what the AST heuristics need from a tree in a single breadth-first pass.
+    
+    analyze() walks the tree once and passes the result to each heuristic, so the
+    returned containers are shared and must not be mutated.
+    
+    Args:
+        tree (ast.AST): Parsed source code
+        
+    Returns:
+        Dict[str, Any]: Walk results:
+            - 'names': Variable, function, class and argument names
+            - 'node_types': Names of all AST node types present
+            - 'total_nodes': Number of nodes in the tree
+            - 'control_flow_nodes': Number of control flow nodes
+            - 'functions': FunctionDef nodes in walk order
+            - 'code_blocks': Function and class nodes in walk order
+            - 'docstrings': Module, class and function docstrings in walk order
+            - 'block_names': Per code block, the names _analyze_naming_style collects
+              from its subtree (assigned names, nested function names, arguments)
+    """
+    names = set()
+    node_types = set()
+    total_nodes = 0
+    control_flow_nodes = 0
+    functions = []
+    code_blocks = []
+    docstrings = []
+    block_names = {}
+    
+    # Breadth-first like ast.walk, but Load/Store/Del context leaves (about a third
+    # of all nodes) are only counted and never queued for the checks below.
+    # Alongside each queued node goes the tuple of code blocks enclosing it
+    todo = deque([tree])
+    todo_owners = deque([()])
+    while todo:
+        node = todo.popleft()
+        owners = todo_owners.popleft()
+        child_owners = owners
+        
+        if isinstance(node, _CODE_BLOCK_NODES):
+            code_blocks.append(node)
+            block_names[node] = []
+            child_owners = owners + (node,)
+        
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, ast.expr_context):
+                node_types.add(type(child).__name__)
+                total_nodes += 1
+            else:
+                todo.append(child)
+                todo_owners.append(child_owners)
+        
+        node_types.add(type(node).__name__)
+        total_nodes += 1
+        
+        if isinstance(node, _CONTROL_FLOW_NODES):
+            control_flow_nodes += 1
+        
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+            if owners and isinstance(node.ctx, ast.Store):
+                for owner in owners:
+                    block_names[owner].append(node.id)
+        elif isinstance(node, ast.FunctionDef):
+            names.add(node.name)
+            functions.append(node)
+            for owner in owners:
+                block_names[owner].append(node.name)
+        elif isinstance(node, ast.ClassDef):
+            names.add(node.name)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+            for owner in owners:
+                block_names[owner].append(node.arg)
+        elif isinstance(node, ast.AsyncFunctionDef):
+            for owner in owners:
+                block_names[owner].append(node.name)
+        
+        # Check if the first statement is a docstring
+        if (isinstance(node, _DOCSTRING_OWNER_NODES) and
+            node.body and
+            isinstance(node.body[0], ast.Expr) and
+            isinstance(node.body[0].value, ast.Constant) and
+            isinstance(node.body[0].value.value, str)):
+            docstrings.append(node.body[0].value.value)
+    
+    return {
+        'names': frozenset(names),
+        'node_types': frozenset(node_types),
+        'total_nodes': total_nodes,
+        'control_flow_nodes': control_flow_nodes,
+        'functions': tuple(functions),
+        'code_blocks': tuple(code_blocks),
+        'docstrings': tuple(docstrings),
+        'block_names': {block: tuple(block_names[block]) for block in code_blocks}
+    }
+
+
+# Neutral results returned when a heuristic cannot run; list fields are stored as
+# tuples and copied into fresh lists by _neutral_result()
+_COMMENT_DEFAULT = MappingProxyType({
+    'generic_comments': 0,
+    'comment_to_code_ratio': 0.0,
+    'repetitive_patterns': 0,
+    'total_comments': 0
+})
+_VARIABLE_DEFAULT = MappingProxyType({
+    'generic_names_count': 0,
+    'total_names_count': 0,
+    'generic_percentage': 0.0,
+    'generic_names_found': ()
+})
+_STRUCTURE_DEFAULT = MappingProxyType({
+    'function_length_variance': 0.0,
+    'average_nesting_depth': 0.0,
+    'node_type_diversity': 0,
+    'control_flow_complexity': 0.0,
+    'structural_uniformity_score': 0.0,
+    'total_functions': 0
+})
+_AI_LANGUAGE_DEFAULT = MappingProxyType({
+    'ai_phrases_found': (),
+    'ai_phrase_count': 0,
+    'conversational_indicators': 0,
+    'disclaimer_patterns': 0,
+    'confidence_level': 0.0
+})
+_STYLE_DEFAULT = MappingProxyType({
+    'style_fingerprints': (),
+    'inconsistency_count': 0,
+    'inconsistency_score': 0.0,
+    'inconsistent_patterns': (),
+    'total_code_blocks': 0
+})
+
+
+def _neutral_result(template: Mapping[str, Any]) -> Dict[str, Any]:
+    # Callers may mutate the result, so hand out a new dict with new lists
+    return {key: list(value) if isinstance(value, tuple) else value for key, value in template.items()}
+
+
 def analyze_comment_patterns(code_string: str) -> Dict[str, Any]:
     # Analyze comments for AI generation patterns
     if not code_string or not isinstance(code_string, str):
-        return {
-            'generic_comments': 0,
-            'comment_to_code_ratio': 0.0,
-            'repetitive_patterns': 0,
-            'total_comments': 0
-        }
-    
-    lines = code_string.split('\n')
+        return _neutral_result(_COMMENT_DEFAULT)
     
-    # Patterns that indicate generic, AI-generated comments
-    # These patterns look for overly simple, templated comment structures
-    generic_comment_patterns = [
-        r'#\s*Function\s+(to\s+)?\w+(\s+\w+){0,2}\s*$',     # "# Function to calculate sum" (short and generic)
-        r'#\s*Variable\s+(to\s+)?\w+(\s+\w+){0,2}\s*$',     # "# Variable to store result" (short and generic)
-        r'#\s*Initialize\s+\w+(\s+\w+){0,1}\s*$',           # "# Initialize variable" (short and generic)
-        r'#\s*Create\s+(a\s+)?\w+(\s+\w+){0,1}\s*$',        # "# Create a list" (short and generic)
-        r'#\s*Set\s+(the\s+)?\w+(\s+\w+){0,1}\s*$',         # "# Set the value" (short and generic)
-        r'#\s*Define\s+(a\s+)?\w+(\s+\w+){0,1}\s*$',        # "# Define a function" (short and generic)
-        r'#\s*Calculate\s+(the\s+)?\w+(\s+\w+){0,1}\s*$',   # "# Calculate the result" (short and generic)
-        r'#\s*Process\s+(the\s+)?\w+(\s+\w+){0,1}\s*$',     # "# Process the data" (short and generic)
-        r'#\s*Return\s+(the\s+)?\w+(\s+\w+){0,1}\s*$',      # "# Return the result" (short and generic)
-        r'#\s*Check\s+(if\s+)?\w+(\s+\w+){0,1}\s*$',        # "# Check if condition" (short and generic)
-        r'#\s*TODO:?\s*[A-Z][a-z]+(\s+\w+){0,1}\s*$',       # "# TODO: Implement" (short and generic)
-        r'#\s*[A-Z][a-z]+\s+[a-z]+\s+here\s*$',            # "# Insert code here"
-        r'#\s*Example\s*(code|usage)\s*$',                  # "# Example code"
-        r'#\s*Sample\s*(code|data)\s*$',                    # "# Sample code"
-    ]
-    
-    comment_lines = []
-    code_lines = []
+    # Let the regex engine find comment and code lines instead of splitting every line
+    comment_lines = [comment.rstrip() for comment in _COMMENT_LINE.findall(code_string)]
+    total_code_lines = sum(1 for _ in _CODE_LINE.finditer(code_string))
     generic_comment_count = 0
     
-    # Analyze each line
-    for line in lines:
-        stripped_line = line.strip()
-        
-        if not stripped_line:  # Skip empty lines
-            continue
-            
-        if stripped_line.startswith('#'):
-            comment_lines.append(stripped_line)
-            
-            # Check for generic patterns
-            for pattern in generic_comment_patterns:
-                if re.search(pattern, stripped_line, re.IGNORECASE):
-                    generic_comment_count += 1
-                    break  # Count each comment only once
-        
-        elif not stripped_line.startswith('#') and stripped_line:
-            code_lines.append(stripped_line)
+    # Check for generic patterns (each comment counts only once)
+    for comment_line in comment_lines:
+        if _is_generic_comment(comment_line):
+            generic_comment_count += 1
     
     # Calculate comment-to-code ratio
-    total_code_lines = len(code_lines)
     total_comment_lines = len(comment_lines)
     
     if total_code_lines > 0:
@@ -92,34 +379,55 @@ def _count_repetitive_comment_patterns(comment_lines: List[str]) -> int:
     if len(comment_lines) < 2:
         return 0
     
-    repetitive_count = 0
-    
     # Look for comments that follow the same structure
-    # (same word count and similar patterns)
-    structure_counts = {}
-    
-    for comment in comment_lines:
-        # Remove the # and strip whitespace
-        clean_comment = comment.lstrip('#').strip()
-        
-        if not clean_comment:
-            continue
-        
-        # Create a structure pattern (word count + first/last words)
-        words = clean_comment.split()
-        if len(words) >= 2:
-            structure = f"{len(words)}:{words[0].lower()}:{words[-1].lower()}"
-            structure_counts[structure] = structure_counts.get(structure, 0) + 1
+    # (same word count and similar patterns): word count + first/last words,
+    # after removing the # (split() also drops surrounding whitespace)
+    structure_counts = Counter(
+        (len(words), words[0].lower(), words[-1].lower())
+        for words in (comment.lstrip('#').split() for comment in comment_lines)
+        if len(words) >= 2
+    )
     
     # Count structures that appear multiple times
-    for count in structure_counts.values():
-        if count >= 3:  # 3 or more similar comments suggest repetitive pattern
-            repetitive_count += count
-    
-    return repetitive_count
+    # (3 or more similar comments suggest repetitive pattern)
+    return sum(count for count in structure_counts.values() if count >= 3)
+
+
+# Common generic names often used in AI-generated code
+_GENERIC_NAMES = frozenset({
+    # Generic variables
+    'data', 'result', 'results', 'temp', 'tmp', 'item', 'items', 'value', 'values',
+    'output', 'input', 'obj', 'object', 'var', 'variable', 'element', 'elements',
+    'content', 'text', 'string', 'number', 'num', 'count', 'total', 'sum',
+    'list', 'array', 'dict', 'dictionary', 'response', 'request', 'params',
+    'config', 'settings', 'options', 'args', 'kwargs', 'info', 'details',
+    
+    # Generic function names
+    'process', 'handle', 'manage', 'execute', 'run', 'perform', 'do_task',
+    'get_data', 'set_data', 'process_data', 'handle_data', 'main_function',
+    'helper', 'utility', 'calculate', 'compute', 'convert', 'transform',
+    'validate', 'check', 'verify', 'parse', 'format', 'generate', 'create',
+    'update', 'delete', 'add', 'remove', 'insert', 'fetch', 'retrieve',
+    
+    # Single letter variables (often AI-generated in examples)
+    'i', 'j', 'k', 'x', 'y', 'z', 'a', 'b', 'c', 'n', 'm'
+})
+
+# Built-in names and common keywords, excluded from the name analysis
+_BUILTIN_NAMES = frozenset({
+    'True', 'False', 'None', 'self', 'cls', '__init__', '__main__',
+    'print', 'len', 'str', 'int', 'float', 'list', 'dict', 'set', 'tuple',
+    'range', 'enumerate', 'zip', 'map', 'filter', 'sum', 'max', 'min',
+    'open', 'file', 'abs', 'round', 'sorted', 'reversed', 'type',
+    'isinstance', 'hasattr', 'getattr', 'setattr', 'delattr'
+})
 
 
-def analyze_variable_names(code_string: str) -> Dict[str, Any]:
+def analyze_variable_names(
+    code_string: str,
+    tree: Optional[ast.AST] = None,
+    walk: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Analyze variable and function names for patterns indicative of AI generation.
     
@@ -130,6 +438,8 @@ def analyze_variable_names(code_string: str) -> Dict[str, Any]:
     
     Args:
         code_string (str): The source code to analyze
+        tree (Optional[ast.AST]): Pre-parsed AST of code_string; parsed here when omitted
+        walk (Optional[Dict[str, Any]]): _walk_tree() result; walked here when omitted
         
     Returns:
         Dict[str, Any]: Dictionary containing analysis results:
@@ -139,78 +449,28 @@ def analyze_variable_names(code_string: str) -> Dict[str, Any]:
             - 'generic_names_found': List of actual generic names found
     """
     if not code_string or not isinstance(code_string, str):
-        return {
-            'generic_names_count': 0,
-            'total_names_count': 0,
-            'generic_percentage': 0.0,
-            'generic_names_found': []
-        }
-    
-    # Common generic names often used in AI-generated code
-    generic_names = {
-        # Generic variables
-        'data', 'result', 'results', 'temp', 'tmp', 'item', 'items', 'value', 'values',
-        'output', 'input', 'obj', 'object', 'var', 'variable', 'element', 'elements',
-        'content', 'text', 'string', 'number', 'num', 'count', 'total', 'sum',
-        'list', 'array', 'dict', 'dictionary', 'response', 'request', 'params',
-        'config', 'settings', 'options', 'args', 'kwargs', 'info', 'details',
-        
-        # Generic function names
-        'process', 'handle', 'manage', 'execute', 'run', 'perform', 'do_task',
-        'get_data', 'set_data', 'process_data', 'handle_data', 'main_function',
-        'helper', 'utility', 'calculate', 'compute', 'convert', 'transform',
-        'validate', 'check', 'verify', 'parse', 'format', 'generate', 'create',
-        'update', 'delete', 'add', 'remove', 'insert', 'fetch', 'retrieve',
-        
-        # Single letter variables (often AI-generated in examples)
-        'i', 'j', 'k', 'x', 'y', 'z', 'a', 'b', 'c', 'n', 'm'
-    }
-    
-    try:
-        # Parse the code using AST
-        tree = ast.parse(code_string)
-    except SyntaxError:
-        # If code has syntax errors, return neutral result
-        return {
-            'generic_names_count': 0,
-            'total_names_count': 0,
-            'generic_percentage': 0.0,
-            'generic_names_found': []
-        }
-    
-    # Extract all names from the AST
-    all_names = set()
+        return _neutral_result(_VARIABLE_DEFAULT)
+    
+    if tree is None and walk is None:
+        try:
+            # Parse the code using AST
+            tree = ast.parse(code_string)
+        except SyntaxError:
+            # If code has syntax errors, return neutral result
+            return _neutral_result(_VARIABLE_DEFAULT)
+    if walk is None:
+        walk = _walk_tree(tree)
+    
+    # Extract all names from the AST (variables, functions, classes and arguments)
+    all_names = walk['names']
     generic_names_found = []
     
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Name):
-            # Variable names
-            all_names.add(node.id)
-        elif isinstance(node, ast.FunctionDef):
-            # Function names
-            all_names.add(node.name)
-        elif isinstance(node, ast.ClassDef):
-            # Class names (less likely to be generic, but we'll track them)
-            all_names.add(node.name)
-        elif isinstance(node, ast.arg):
-            # Function arguments
-            all_names.add(node.arg)
-    
-    # Filter out built-in names and common keywords
-    builtin_names = {
-        'True', 'False', 'None', 'self', 'cls', '__init__', '__main__',
-        'print', 'len', 'str', 'int', 'float', 'list', 'dict', 'set', 'tuple',
-        'range', 'enumerate', 'zip', 'map', 'filter', 'sum', 'max', 'min',
-        'open', 'file', 'abs', 'round', 'sorted', 'reversed', 'type',
-        'isinstance', 'hasattr', 'getattr', 'setattr', 'delattr'
-    }
-    
-    # Remove built-in names
-    filtered_names = all_names - builtin_names
+    # Remove built-in names and common keywords
+    filtered_names = all_names - _BUILTIN_NAMES
     
     # Check for generic names
     for name in filtered_names:
-        if name.lower() in generic_names:
+        if name.lower() in _GENERIC_NAMES:
             generic_names_found.append(name)
     
     total_names_count = len(filtered_names)
@@ -229,7 +489,11 @@ def analyze_variable_names(code_string: str) -> Dict[str, Any]:
     }
 
 
-def analyze_code_structure(code_string: str) -> Dict[str, Any]:
+def analyze_code_structure(
+    code_string: str,
+    tree: Optional[ast.AST] = None,
+    walk: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Analyze code structure using AST for patterns indicative of AI generation.
     
@@ -242,6 +506,8 @@ def analyze_code_structure(code_string: str) -> Dict[str, Any]:
     
     Args:
         code_string (str): The source code to analyze
+        tree (Optional[ast.AST]): Pre-parsed AST of code_string; parsed here when omitted
+        walk (Optional[Dict[str, Any]]): _walk_tree() result; walked here when omitted
         
     Returns:
         Dict[str, Any]: Dictionary containing analysis results:
@@ -253,70 +519,52 @@ def analyze_code_structure(code_string: str) -> Dict[str, Any]:
             - 'total_functions': Total number of functions analyzed
     """
     if not code_string or not isinstance(code_string, str):
-        return {
-            'function_length_variance': 0.0,
-            'average_nesting_depth': 0.0,
-            'node_type_diversity': 0,
-            'control_flow_complexity': 0.0,
-            'structural_uniformity_score': 0.0,
-            'total_functions': 0
-        }
-    
-    try:
-        # Parse the code using AST
-        tree = ast.parse(code_string)
-    except SyntaxError:
-        # If code has syntax errors, return neutral result
-        return {
-            'function_length_variance': 0.0,
-            'average_nesting_depth': 0.0,
-            'node_type_diversity': 0,
-            'control_flow_complexity': 0.0,
-            'structural_uniformity_score': 0.0,
-            'total_functions': 0
-        }
+        return _neutral_result(_STRUCTURE_DEFAULT)
+    
+    if tree is None and walk is None:
+        try:
+            # Parse the code using AST
+            tree = ast.parse(code_string)
+        except SyntaxError:
+            # If code has syntax errors, return neutral result
+            return _neutral_result(_STRUCTURE_DEFAULT)
+    if walk is None:
+        walk = _walk_tree(tree)
     
     # Collect metrics
-    function_lengths = []
-    nesting_depths = []
-    node_types = set()
-    control_flow_nodes = 0
-    total_nodes = 0
-    
-    # Analyze each function in the code
-    for node in ast.walk(tree):
-        # Count all node types for diversity analysis
-        node_types.add(type(node).__name__)
-        total_nodes += 1
-        
-        # Count control flow structures
-        if isinstance(node, (ast.If, ast.For, ast.While, ast.Try, ast.With, ast.Match)):
-            control_flow_nodes += 1
+    total_functions = 0
+    length_sum = 0
+    length_square_sum = 0
+    nesting_depth_sum = 0
+    node_types = walk['node_types']
+    control_flow_nodes = walk['control_flow_nodes']
+    total_nodes = walk['total_nodes']
+    
+    # Analyze each function in the code, accumulating sums in a single pass
+    for node in walk['functions']:
+        # Calculate function length (number of statements)
+        func_length = len(node.body)
+        total_functions += 1
+        length_sum += func_length
+        length_square_sum += func_length * func_length
         
-        # Analyze function structures
-        if isinstance(node, ast.FunctionDef):
-            # Calculate function length (number of statements)
-            func_length = len(node.body)
-            function_lengths.append(func_length)
-            
-            # Calculate maximum nesting depth for this function
-            max_depth = _calculate_max_nesting_depth(node)
-            nesting_depths.append(max_depth)
-    
-    # Calculate metrics
-    total_functions = len(function_lengths)
+        # Calculate maximum nesting depth for this function
+        nesting_depth_sum += _calculate_max_nesting_depth(node)
     
     # Function length variance (lower = more uniform/suspicious)
-    if len(function_lengths) > 1:
-        mean_length = sum(function_lengths) / len(function_lengths)
-        variance = sum((x - mean_length) ** 2 for x in function_lengths) / len(function_lengths)
+    if total_functions > 1:
+        # Lengths are integers, so the sums are exact and this avoids a second pass
+        variance = (
+            (total_functions * length_square_sum - length_sum * length_sum)
+            / (total_functions * total_functions)
+        )
         function_length_variance = round(variance, 2)
     else:
         function_length_variance = 0.0
     
     # Average nesting depth
-    if nesting_depths:
-        average_nesting_depth = round(sum(nesting_depths) / len(nesting_depths), 2)
+    if total_functions:
+        average_nesting_depth = round(nesting_depth_sum / total_functions, 2)
     else:
         average_nesting_depth = 0.0
     
@@ -351,26 +599,24 @@ def _calculate_max_nesting_depth(node: ast.AST, current_depth: int = 0) -> int:
     
     Args:
         node (ast.AST): The AST node to analyze
-        current_depth (int): Current depth in the traversal
+        current_depth (int): Depth assigned to the starting node
         
     Returns:
         int: Maximum nesting depth found
     """
     max_depth = current_depth
     
-    # Node types that increase nesting depth
-    nesting_nodes = (
-        ast.If, ast.For, ast.While, ast.With, ast.Try, ast.ExceptHandler,
-        ast.FunctionDef, ast.ClassDef, ast.AsyncWith, ast.AsyncFor
-    )
-    
-    for child in ast.iter_child_nodes(node):
-        if isinstance(child, nesting_nodes):
-            child_depth = _calculate_max_nesting_depth(child, current_depth + 1)
-            max_depth = max(max_depth, child_depth)
-        else:
-            child_depth = _calculate_max_nesting_depth(child, current_depth)
-            max_depth = max(max_depth, child_depth)
+    # Iterative DFS: no Python frame per node and no recursion limit on deep trees
+    stack = [(node, current_depth)]
+    while stack:
+        parent, depth = stack.pop()
+        if depth > max_depth:
+            max_depth = depth
+        for child in ast.iter_child_nodes(parent):
+            if isinstance(child, _NESTING_NODES):
+                stack.append((child, depth + 1))
+            else:
+                stack.append((child, depth))
     
     return max_depth
 
@@ -430,7 +676,11 @@ def _calculate_uniformity_score(
     return round(min(score, 100.0), 2)
 
 
-def match_ai_language_patterns(code_string: str) -> Dict[str, Any]:
+def match_ai_language_patterns(
+    code_string: str,
+    tree: Optional[ast.AST] = None,
+    walk: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Scan comments and docstrings for AI language patterns and conversational artifacts.
     
@@ -442,6 +692,8 @@ def match_ai_language_patterns(code_string: str) -> Dict[str, Any]:
     
     Args:
         code_string (str): The source code to analyze
+        tree (Optional[ast.AST]): Pre-parsed AST of code_string; parsed here when omitted
+        walk (Optional[Dict[str, Any]]): _walk_tree() result; walked here when omitted
         
     Returns:
         Dict[str, Any]: Dictionary containing analysis results:
@@ -452,120 +704,53 @@ def match_ai_language_patterns(code_string: str) -> Dict[str, Any]:
             - 'confidence_level': Confidence that AI language is present (0-100)
     """
     if not code_string or not isinstance(code_string, str):
-        return {
-            'ai_phrases_found': [],
-            'ai_phrase_count': 0,
-            'conversational_indicators': 0,
-            'disclaimer_patterns': 0,
-            'confidence_level': 0.0
-        }
+        return _neutral_result(_AI_LANGUAGE_DEFAULT)
     
     # Extract all comments and docstrings
-    comment_text = _extract_comments_and_docstrings(code_string)
+    comment_text = _extract_comments_and_docstrings(code_string, tree, walk)
     
     if not comment_text:
-        return {
-            'ai_phrases_found': [],
-            'ai_phrase_count': 0,
-            'conversational_indicators': 0,
-            'disclaimer_patterns': 0,
-            'confidence_level': 0.0
-        }
+        return _neutral_result(_AI_LANGUAGE_DEFAULT)
     
     # Combine all text for analysis
     all_text = ' '.join(comment_text).lower()
     
-    # Define AI language patterns
-    ai_self_references = [
-        r'\bas an ai\b',
-        r'\bai language model\b',
-        r'\bai assistant\b',
-        r'\bi am an ai\b',
-        r'\bi\'m an ai\b',
-        r'\bchatgpt\b',
-        r'\bgpt-\d+\b',
-        r'\bclaude\b(?!\s+\w+\s+\w+)',  # Claude but not "Claude Shannon algorithm"
-        r'\bcopilot\b(?!\s+\w+\s+\w+)', # GitHub Copilot but not "autopilot system"
-        r'\bgemini\b(?!\s+\w+\s+\w+)',  # Google Gemini but not "Gemini constellation"
-        r'\blanguage model\b',
-        r'\bneural network\b(?!\s+implementation)',  # AI reference, not implementation
-    ]
-    
-    conversational_patterns = [
-        r'\bhere\'s\s+(?:an?\s+)?example\b',
-        r'\bhere\s+is\s+(?:an?\s+)?example\b',
-        r'\blet me\s+(?:help|show|explain|provide)\b',
-        r'\bi\'ll\s+(?:help|show|explain|provide|create|write)\b',
-        r'\byou\s+can\s+(?:use|try|modify|adapt)\b',
-        r'\bfeel\s+free\s+to\b',
-        r'\bhope\s+this\s+helps\b',
-        r'\blet\s+me\s+know\s+if\b',
-        r'\bif\s+you\s+(?:need|want|have)\b',
-        r'\bplease\s+(?:note|let\s+me\s+know|feel\s+free)\b',
-        r'\bthis\s+(?:should|will|can)\s+(?:help|work|solve)\b',
-        r'\byou\s+(?:might|may|should|could)\s+(?:want|need|consider)\b',
-    ]
-    
-    disclaimer_patterns = [
-        r'\bi\s+cannot\s+(?:access|provide|guarantee)\b',
-        r'\bi\s+don\'t\s+have\s+(?:access|real-time|current)\b',
-        r'\breal-time\s+(?:data|information)\b',
-        r'\bcurrent\s+(?:date|time|year)\b(?!\s+implementation)',
-        r'\bup-to-date\s+information\b',
-        r'\bmay\s+(?:vary|change|differ)\s+(?:depending|based)\b',
-        r'\bplease\s+(?:verify|check|confirm|update)\b',
-        r'\bas\s+of\s+my\s+last\s+(?:update|training)\b',
-        r'\bknowledge\s+cutoff\b',
-        r'\btraining\s+data\b',
-        r'\bmay\s+not\s+be\s+(?:accurate|current|up-to-date)\b',
-        r'\bconsult\s+(?:official|latest|current)\s+documentation\b',
-    ]
-    
-    example_template_patterns = [
-        r'\bsample\s+(?:code|implementation|usage)\b',
-        r'\bexample\s+(?:code|implementation|usage)\b',
-        r'\bbasic\s+(?:example|template|implementation)\b',
-        r'\bsimple\s+(?:example|template|implementation)\b',
-        r'\btemplate\s+(?:for|code)\b',
-        r'\bplaceholder\s+(?:for|code|text)\b',
-        r'\breplace\s+(?:this|these)\s+(?:with|values)\b',
-        r'\bmodify\s+(?:as|this)\s+(?:needed|per)\b',
-        r'\badjust\s+(?:as|this)\s+(?:needed|required)\b',
-        r'\bcustomize\s+(?:as|this)\s+(?:needed|required)\b',
-    ]
-    
     # Count matches for each category
     ai_phrases_found = []
     conversational_count = 0
     disclaimer_count = 0
     
+    # Most code has no AI phrasing at all; skip the per-pattern scans in that case
+    words = frozenset(_ASCII_WORD.findall(all_text))
+    if words.isdisjoint(_AI_LANGUAGE_ANCHOR_WORDS) or not _ANY_AI_LANGUAGE_PATTERN.search(all_text):
+        return _neutral_result(_AI_LANGUAGE_DEFAULT)
+    
     # Check AI self-references
-    for pattern in ai_self_references:
-        matches = re.findall(pattern, all_text, re.IGNORECASE)
-        for match in matches:
-            ai_phrases_found.append(match)
+    if not words.isdisjoint(_SELF_REFERENCE_ANCHORS):
+        for pattern in _AI_SELF_REFERENCE_PATTERNS:
+            ai_phrases_found.extend(pattern.findall(all_text))
     
     # Check conversational patterns
-    for pattern in conversational_patterns:
-        if re.search(pattern, all_text, re.IGNORECASE):
-            conversational_count += 1
-            # Also add to ai_phrases_found for tracking
-            match = re.search(pattern, all_text, re.IGNORECASE)
+    if not words.isdisjoint(_CONVERSATIONAL_ANCHORS):
+        for pattern in _CONVERSATIONAL_PATTERNS:
+            match = pattern.search(all_text)
             if match:
+                conversational_count += 1
+                # Also add to ai_phrases_found for tracking
                 ai_phrases_found.append(match.group())
     
     # Check disclaimer patterns
-    for pattern in disclaimer_patterns:
-        if re.search(pattern, all_text, re.IGNORECASE):
-            disclaimer_count += 1
-            match = re.search(pattern, all_text, re.IGNORECASE)
+    if not words.isdisjoint(_DISCLAIMER_ANCHORS):
+        for pattern in _DISCLAIMER_PATTERNS:
+            match = pattern.search(all_text)
             if match:
+                disclaimer_count += 1
                 ai_phrases_found.append(match.group())
     
     # Check example/template patterns
-    for pattern in example_template_patterns:
-        if re.search(pattern, all_text, re.IGNORECASE):
-            match = re.search(pattern, all_text, re.IGNORECASE)
+    if not words.isdisjoint(_EXAMPLE_TEMPLATE_ANCHORS):
+        for pattern in _EXAMPLE_TEMPLATE_PATTERNS:
+            match = pattern.search(all_text)
             if match:
                 ai_phrases_found.append(match.group())
     
@@ -583,43 +768,32 @@ def match_ai_language_patterns(code_string: str) -> Dict[str, Any]:
     }
 
 
-def _extract_comments_and_docstrings(code_string: str) -> List[str]:
+def _extract_comments_and_docstrings(
+    code_string: str,
+    tree: Optional[ast.AST] = None,
+    walk: Optional[Dict[str, Any]] = None
+) -> List[str]:
     """
     Extract all comments and docstrings from code.
     
     Args:
         code_string (str): The source code to analyze
+        tree (Optional[ast.AST]): Pre-parsed AST of code_string; parsed here when omitted
+        walk (Optional[Dict[str, Any]]): _walk_tree() result; walked here when omitted
         
     Returns:
         List[str]: List of comment and docstring text
     """
-    comments_and_docs = []
-    
     # Extract line comments
-    lines = code_string.split('\n')
-    for line in lines:
-        stripped = line.strip()
-        if stripped.startswith('#'):
-            comments_and_docs.append(stripped[1:].strip())
+    comments_and_docs = [comment[1:].strip() for comment in _COMMENT_LINE.findall(code_string)]
     
     # Extract docstrings using AST
     try:
-        tree = ast.parse(code_string)
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.ClassDef, ast.AsyncFunctionDef)):
-                # Check if the first statement is a docstring
-                if (node.body and 
-                    isinstance(node.body[0], ast.Expr) and 
-                    isinstance(node.body[0].value, ast.Constant) and 
-                    isinstance(node.body[0].value.value, str)):
-                    comments_and_docs.append(node.body[0].value.value)
-            # Module-level docstrings
-            elif isinstance(node, ast.Module):
-                if (node.body and 
-                    isinstance(node.body[0], ast.Expr) and 
-                    isinstance(node.body[0].value, ast.Constant) and 
-                    isinstance(node.body[0].value.value, str)):
-                    comments_and_docs.append(node.body[0].value.value)
+        if walk is None:
+            if tree is None:
+                tree = ast.parse(code_string)
+            walk = _walk_tree(tree)
+        comments_and_docs.extend(walk['docstrings'])
     except SyntaxError:
         # If AST parsing fails, just use line comments
         pass
@@ -676,7 +850,11 @@ def _calculate_ai_language_confidence(
     return round(min(confidence, 100.0), 2)
 
 
-def analyze_style_inconsistency(code_string: str) -> Dict[str, Any]:
+def analyze_style_inconsistency(
+    code_string: str,
+    tree: Optional[ast.AST] = None,
+    walk: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
     """
     Analyze code for style inconsistencies that may indicate AI-injected content.
     
@@ -689,6 +867,8 @@ def analyze_style_inconsistency(code_string: str) -> Dict[str, Any]:
     
     Args:
         code_string (str): The source code to analyze
+        tree (Optional[ast.AST]): Pre-parsed AST of code_string; parsed here when omitted
+        walk (Optional[Dict[str, Any]]): _walk_tree() result; walked here when omitted
         
     Returns:
         Dict[str, Any]: Dictionary containing analysis results:
@@ -699,40 +879,33 @@ def analyze_style_inconsistency(code_string: str) -> Dict[str, Any]:
             - 'total_code_blocks': Total number of analyzable code blocks
     """
     if not code_string or not isinstance(code_string, str):
-        return {
-            'style_fingerprints': [],
-            'inconsistency_count': 0,
-            'inconsistency_score': 0.0,
-            'inconsistent_patterns': [],
-            'total_code_blocks': 0
-        }
-    
-    try:
-        # Parse the code into an AST
-        tree = ast.parse(code_string)
-    except SyntaxError:
-        # Return neutral results for invalid code
-        return {
-            'style_fingerprints': [],
-            'inconsistency_count': 0,
-            'inconsistency_score': 0.0,
-            'inconsistent_patterns': [],
-            'total_code_blocks': 0
-        }
+        return _neutral_result(_STYLE_DEFAULT)
+    
+    if tree is None and walk is None:
+        try:
+            # Parse the code into an AST
+            tree = ast.parse(code_string)
+        except SyntaxError:
+            # Return neutral results for invalid code
+            return _neutral_result(_STYLE_DEFAULT)
+    if walk is None:
+        walk = _walk_tree(tree)
     
     lines = code_string.split('\n')
+    # Stripped once here; every block's helpers slice it instead of re-stripping
+    stripped_lines = [line.strip() for line in lines]
     style_fingerprints = []
+    block_names = walk['block_names']
     
     # Analyze each function and class for style patterns
-    for node in ast.walk(tree):
-        if isinstance(node, (ast.FunctionDef, ast.ClassDef, ast.AsyncFunctionDef)):
-            fingerprint = _create_style_fingerprint(node, lines)
-            if fingerprint:
-                style_fingerprints.append(fingerprint)
+    for node in walk['code_blocks']:
+        fingerprint = _create_style_fingerprint(node, lines, block_names[node], stripped_lines)
+        if fingerprint:
+            style_fingerprints.append(fingerprint)
     
     # If we don't have enough code blocks, analyze the global scope
     if len(style_fingerprints) < 2:
-        global_fingerprint = _create_global_style_fingerprint(lines)
+        global_fingerprint = _create_global_style_fingerprint(lines, stripped_lines)
         if global_fingerprint and len(style_fingerprints) == 0:
             style_fingerprints.append(global_fingerprint)
     
@@ -763,13 +936,20 @@ def analyze_style_inconsistency(code_string: str) -> Dict[str, Any]:
     }
 
 
-def _create_style_fingerprint(node: ast.AST, lines: List[str]) -> Dict[str, Any]:
+def _create_style_fingerprint(
+    node: ast.AST, lines: List[str], names: Optional[Sequence[str]] = None,
+    stripped_lines: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Create a style fingerprint for a specific AST node (function or class).
     
     Args:
         node (ast.AST): The AST node to analyze
         lines (List[str]): All lines of the source code
+        names (Optional[Sequence[str]]): Names collected for node by _walk_tree;
+            gathered from the node's subtree when omitted
+        stripped_lines (Optional[List[str]]): lines with each entry stripped;
+            computed per block when omitted
         
     Returns:
         Dict[str, Any]: Style fingerprint containing various style metrics
@@ -785,18 +965,22 @@ def _create_style_fingerprint(node: ast.AST, lines: List[str]) -> Dict[str, Any]
         return None
     
     block_lines = lines[start_line:end_line]
+    if stripped_lines is None:
+        block_stripped = [line.strip() for line in block_lines]
+    else:
+        block_stripped = stripped_lines[start_line:end_line]
     
     # Analyze indentation style
-    indentation_style = _analyze_indentation_style(block_lines)
+    indentation_style = _analyze_indentation_style(block_lines, block_stripped)
     
     # Analyze variable naming patterns
-    naming_style = _analyze_naming_style(node)
+    naming_style = _analyze_naming_style(node, names)
     
     # Analyze comment patterns
-    comment_style = _analyze_comment_style(block_lines)
+    comment_style = _analyze_comment_style(block_lines, block_stripped)
     
     # Analyze line length patterns
-    line_length_style = _analyze_line_length_style(block_lines)
+    line_length_style = _analyze_line_length_style(block_lines, block_stripped)
     
     return {
         'node_type': type(node).__name__,
@@ -809,20 +993,25 @@ def _create_style_fingerprint(node: ast.AST, lines: List[str]) -> Dict[str, Any]
     }
 
 
-def _create_global_style_fingerprint(lines: List[str]) -> Dict[str, Any]:
+def _create_global_style_fingerprint(
+    lines: List[str], stripped_lines: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Create a style fingerprint for the global scope when no functions/classes exist.
     
     Args:
         lines (List[str]): All lines of the source code
+        stripped_lines (Optional[List[str]]): lines with each entry stripped
         
     Returns:
         Dict[str, Any]: Style fingerprint for global scope
     """
     # Use the entire file as one block
-    indentation_style = _analyze_indentation_style(lines)
-    comment_style = _analyze_comment_style(lines)
-    line_length_style = _analyze_line_length_style(lines)
+    if stripped_lines is None:
+        stripped_lines = [line.strip() for line in lines]
+    indentation_style = _analyze_indentation_style(lines, stripped_lines)
+    comment_style = _analyze_comment_style(lines, stripped_lines)
+    line_length_style = _analyze_line_length_style(lines, stripped_lines)
     
     return {
         'node_type': 'Global',
@@ -835,42 +1024,46 @@ def _create_global_style_fingerprint(lines: List[str]) -> Dict[str, Any]:
     }
 
 
-def _analyze_indentation_style(block_lines: List[str]) -> Dict[str, Any]:
+def _analyze_indentation_style(
+    block_lines: List[str], stripped_lines: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Analyze indentation patterns in a code block.
     
     Args:
         block_lines (List[str]): Lines of code to analyze
+        stripped_lines (Optional[List[str]]): block_lines with each line stripped
         
     Returns:
         Dict[str, Any]: Indentation style analysis
     """
     tab_count = 0
-    space_counts = {}
+    space_indents = []
     total_indented_lines = 0
     
-    for line in block_lines:
-        if not line.strip():  # Skip empty lines
+    if stripped_lines is None:
+        stripped_lines = [line.strip() for line in block_lines]
+    
+    for line, stripped in zip(block_lines, stripped_lines):
+        if not stripped:  # Skip empty lines
             continue
             
-        # Count leading whitespace
-        leading_chars = len(line) - len(line.lstrip())
-        if leading_chars > 0:
+        # Check for leading whitespace (the same characters lstrip() removes)
+        first_char = line[0]
+        if first_char.isspace():
             total_indented_lines += 1
             
-            if line.startswith('\t'):
+            if first_char == '\t':
                 tab_count += 1
             else:
-                # Count spaces
-                space_count = 0
-                for char in line:
-                    if char == ' ':
-                        space_count += 1
-                    else:
-                        break
+                # Count leading spaces with one C-level strip instead of a per-char loop
+                space_count = len(line) - len(line.lstrip(' '))
                 
                 if space_count > 0:
-                    space_counts[space_count] = space_counts.get(space_count, 0) + 1
+                    space_indents.append(space_count)
+    
+    # Tallied in one C-level pass; keys keep first-seen order like the per-line dict did
+    space_counts = dict(Counter(space_indents))
     
     # Determine primary style
     if total_indented_lines == 0:
@@ -895,53 +1088,49 @@ def _analyze_indentation_style(block_lines: List[str]) -> Dict[str, Any]:
     }
 
 
-def _analyze_naming_style(node: ast.AST) -> Dict[str, Any]:
+def _analyze_naming_style(node: ast.AST, names: Optional[Sequence[str]] = None) -> Dict[str, Any]:
     """
     Analyze variable and function naming patterns in an AST node.
     
     Args:
         node (ast.AST): The AST node to analyze
+        names (Optional[Sequence[str]]): Names already collected from the node's
+            subtree, as in _walk_tree's 'block_names'; walked here when omitted
         
     Returns:
         Dict[str, Any]: Naming style analysis
     """
-    names = []
-    
-    # Extract variable and function names from the node
-    for child in ast.walk(node):
-        if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
-            names.append(child.id)
-        elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
-            if child != node:  # Don't include the current node's name twice
-                names.append(child.name)
-        elif isinstance(child, ast.arg):
-            names.append(child.arg)
+    if names is None:
+        names = []
+        
+        # Extract variable and function names from the node
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store):
+                names.append(child.id)
+            elif isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                if child != node:  # Don't include the current node's name twice
+                    names.append(child.name)
+            elif isinstance(child, ast.arg):
+                names.append(child.arg)
     
     if not names:
         return {'style': 'unknown', 'consistency': 1.0}
     
     # Analyze naming conventions
-    snake_case_count = 0
-    camel_case_count = 0
-    pascal_case_count = 0
+    style_counts = {
+        'snake_case': 0,
+        'camelCase': 0,
+        'PascalCase': 0
+    }
     
     for name in names:
-        if '_' in name and name.islower():
-            snake_case_count += 1
-        elif name[0].islower() and any(c.isupper() for c in name[1:]):
-            camel_case_count += 1
-        elif name[0].isupper() and any(c.isupper() for c in name[1:]):
-            pascal_case_count += 1
+        convention = _naming_convention(name)
+        if convention is not None:
+            style_counts[convention] += 1
     
     total_names = len(names)
     
     # Determine primary style
-    style_counts = {
-        'snake_case': snake_case_count,
-        'camelCase': camel_case_count,
-        'PascalCase': pascal_case_count
-    }
-    
     primary_style = max(style_counts, key=style_counts.get)
     consistency = style_counts[primary_style] / total_names
     
@@ -951,25 +1140,54 @@ def _analyze_naming_style(node: ast.AST) -> Dict[str, Any]:
     }
 
 
-def _analyze_comment_style(block_lines: List[str]) -> Dict[str, Any]:
+@functools.lru_cache(maxsize=4096)
+def _naming_convention(name: str) -> Optional[str]:
+    """
+    Classify a single identifier for _analyze_naming_style.
+    
+    Identifiers like 'self', 'data' and 'i' repeat across blocks and files, so the
+    character checks are cached per name.
+    
+    Args:
+        name (str): Identifier to classify
+        
+    Returns:
+        Optional[str]: 'snake_case', 'camelCase', 'PascalCase' or None
+    """
+    if '_' in name and name.islower():
+        return 'snake_case'
+    if name[0].islower() and any(c.isupper() for c in name[1:]):
+        return 'camelCase'
+    if name[0].isupper() and any(c.isupper() for c in name[1:]):
+        return 'PascalCase'
+    return None
+
+
+def _analyze_comment_style(
+    block_lines: List[str], stripped_lines: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Analyze comment patterns in a code block.
     
     Args:
         block_lines (List[str]): Lines of code to analyze
+        stripped_lines (Optional[List[str]]): block_lines with each line stripped
         
     Returns:
         Dict[str, Any]: Comment style analysis
     """
-    total_lines = len([line for line in block_lines if line.strip()])
+    if stripped_lines is None:
+        stripped_lines = [line.strip() for line in block_lines]
+    
+    total_lines = 0
     comment_lines = 0
     inline_comments = 0
     block_comments = 0
     
-    for line in block_lines:
-        stripped = line.strip()
+    for line, stripped in zip(block_lines, stripped_lines):
         if not stripped:
             continue
+        total_lines += 1
             
         if stripped.startswith('#'):
             comment_lines += 1
@@ -990,22 +1208,27 @@ def _analyze_comment_style(block_lines: List[str]) -> Dict[str, Any]:
     }
 
 
-def _analyze_line_length_style(block_lines: List[str]) -> Dict[str, Any]:
+def _analyze_line_length_style(
+    block_lines: List[str], stripped_lines: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Analyze line length patterns in a code block.
     
     Args:
         block_lines (List[str]): Lines of code to analyze
+        stripped_lines (Optional[List[str]]): block_lines with each line stripped
         
     Returns:
         Dict[str, Any]: Line length style analysis
     """
-    non_empty_lines = [line for line in block_lines if line.strip()]
+    if stripped_lines is None:
+        stripped_lines = [line.strip() for line in block_lines]
+    
+    lengths = [len(line) for line, stripped in zip(block_lines, stripped_lines) if stripped]
     
-    if not non_empty_lines:
+    if not lengths:
         return {'average_length': 0.0, 'max_length': 0, 'variance': 0.0}
     
-    lengths = [len(line) for line in non_empty_lines]
     average_length = sum(lengths) / len(lengths)
     max_length = max(lengths)
     
@@ -1034,39 +1257,55 @@ def _detect_style_inconsistencies(style_fingerprints: List[Dict[str, Any]]) -> L
     if len(style_fingerprints) < 2:
         return inconsistencies
     
-    # Check indentation style consistency
-    indentation_styles = [fp['indentation_style']['style'] for fp in style_fingerprints]
-    unique_indentation_styles = set(indentation_styles)
-    
-    if len(unique_indentation_styles) > 1:
+    # One pass over the fingerprints: note whether each style ever differs from the
+    # first block's and track the density and variance extremes
+    first = style_fingerprints[0]
+    first_indentation = first['indentation_style']['style']
+    first_naming = first['naming_style']['style']
+    mixed_indentation = False
+    mixed_naming = False
+    has_unknown_naming = first_naming == 'unknown'
+    min_density = max_density = first['comment_style']['comment_density']
+    min_variance = max_variance = first['line_length_style']['variance']
+    
+    for fp in style_fingerprints[1:]:
+        if fp['indentation_style']['style'] != first_indentation:
+            mixed_indentation = True
+        naming = fp['naming_style']['style']
+        if naming != first_naming:
+            mixed_naming = True
+        if naming == 'unknown':
+            has_unknown_naming = True
+        density = fp['comment_style']['comment_density']
+        if density > max_density:
+            max_density = density
+        if density < min_density:
+            min_density = density
+        variance = fp['line_length_style']['variance']
+        if variance > max_variance:
+            max_variance = variance
+        if variance < min_variance:
+            min_variance = variance
+    
+    # Check indentation style consistency; the set is only built for the message
+    if mixed_indentation:
+        unique_indentation_styles = {fp['indentation_style']['style'] for fp in style_fingerprints}
         inconsistencies.append(f"Mixed indentation styles: {', '.join(unique_indentation_styles)}")
     
     # Check naming style consistency
-    naming_styles = [fp['naming_style']['style'] for fp in style_fingerprints]
-    unique_naming_styles = set(naming_styles)
-    
-    if len(unique_naming_styles) > 1 and 'unknown' not in unique_naming_styles:
+    if mixed_naming and not has_unknown_naming:
+        unique_naming_styles = {fp['naming_style']['style'] for fp in style_fingerprints}
         inconsistencies.append(f"Mixed naming conventions: {', '.join(unique_naming_styles)}")
     
     # Check for significant differences in comment density
-    comment_densities = [fp['comment_style']['comment_density'] for fp in style_fingerprints]
-    if comment_densities:
-        max_density = max(comment_densities)
-        min_density = min(comment_densities)
-        
-        if max_density - min_density > 0.5:  # More than 50% difference
-            inconsistencies.append(f"Inconsistent comment density: {min_density:.1f} to {max_density:.1f}")
+    if max_density - min_density > 0.5:  # More than 50% difference
+        inconsistencies.append(f"Inconsistent comment density: {min_density:.1f} to {max_density:.1f}")
     
     # Check for significant differences in line length patterns
-    line_length_variances = [fp['line_length_style']['variance'] for fp in style_fingerprints]
-    if line_length_variances:
-        max_variance = max(line_length_variances)
-        min_variance = min(line_length_variances)
-        
-        if max_variance > 0 and min_variance > 0:
-            variance_ratio = max_variance / min_variance
-            if variance_ratio > 3.0:  # One block has 3x more line length variance
-                inconsistencies.append(f"Inconsistent line length patterns: variance ratio {variance_ratio:.1f}")
+    if max_variance > 0 and min_variance > 0:
+        variance_ratio = max_variance / min_variance
+        if variance_ratio > 3.0:  # One block has 3x more line length variance
+            inconsistencies.append(f"Inconsistent line length patterns: variance ratio {variance_ratio:.1f}")
     
     return inconsistencies
 
@@ -1097,45 +1336,16 @@ def _calculate_style_inconsistency_score(inconsistencies: List[str], total_block
     return round(min(final_score, 100.0), 1)
 
 
-def analyze(code_string: str) -> Dict[str, Any]:
+def analyze(code_string: str, tree: Optional[ast.AST] = None) -> Dict[str, Any]:
     # Main analysis function - runs all heuristic checks
     if not code_string or not isinstance(code_string, str):
         # Return empty results for invalid input
         empty_result = {
-            'comment_patterns': {
-                'generic_comments': 0,
-                'comment_to_code_ratio': 0.0,
-                'repetitive_patterns': 0,
-                'total_comments': 0
-            },
-            'variable_names': {
-                'generic_names_count': 0,
-                'total_names_count': 0,
-                'generic_percentage': 0.0,
-                'generic_names_found': []
-            },
-            'code_structure': {
-                'function_length_variance': 0.0,
-                'average_nesting_depth': 0.0,
-                'node_type_diversity': 0,
-                'control_flow_complexity': 0.0,
-                'structural_uniformity_score': 0.0,
-                'total_functions': 0
-            },
-            'ai_language_patterns': {
-                'ai_phrases_found': [],
-                'ai_phrase_count': 0,
-                'conversational_indicators': 0,
-                'disclaimer_patterns': 0,
-                'confidence_level': 0.0
-            },
-            'style_inconsistency': {
-                'style_fingerprints': [],
-                'inconsistency_count': 0,
-                'inconsistency_score': 0.0,
-                'inconsistent_patterns': [],
-                'total_code_blocks': 0
-            },
+            'comment_patterns': _neutral_result(_COMMENT_DEFAULT),
+            'variable_names': _neutral_result(_VARIABLE_DEFAULT),
+            'code_structure': _neutral_result(_STRUCTURE_DEFAULT),
+            'ai_language_patterns': _neutral_result(_AI_LANGUAGE_DEFAULT),
+            'style_inconsistency': _neutral_result(_STYLE_DEFAULT),
             'summary': {
                 'total_indicators': 0,
                 'risk_factors': [],
@@ -1151,69 +1361,48 @@ def analyze(code_string: str) -> Dict[str, Any]:
         return empty_result
     
     # Track analysis metadata
-    import datetime
     analysis_timestamp = datetime.datetime.now().isoformat()
     errors_encountered = []
+
+    # Parse and walk once and share the results; on failure each heuristic falls back
+    # to its own handling
+    if tree is None:
+        try:
+            tree = ast.parse(code_string)
+        except (SyntaxError, ValueError):
+            tree = None
+    walk = _walk_tree(tree) if tree is not None else None
     
     # Run each heuristic analysis
     try:
         comment_results = analyze_comment_patterns(code_string)
     except Exception as e:
         errors_encountered.append(f"Comment analysis error: {str(e)}")
-        comment_results = {
-            'generic_comments': 0,
-            'comment_to_code_ratio': 0.0,
-            'repetitive_patterns': 0,
-            'total_comments': 0
-        }
+        comment_results = _neutral_result(_COMMENT_DEFAULT)
     
     try:
-        variable_results = analyze_variable_names(code_string)
+        variable_results = analyze_variable_names(code_string, tree, walk)
     except Exception as e:
         errors_encountered.append(f"Variable analysis error: {str(e)}")
-        variable_results = {
-            'generic_names_count': 0,
-            'total_names_count': 0,
-            'generic_percentage': 0.0,
-            'generic_names_found': []
-        }
+        variable_results = _neutral_result(_VARIABLE_DEFAULT)
     
     try:
-        structure_results = analyze_code_structure(code_string)
+        structure_results = analyze_code_structure(code_string, tree, walk)
     except Exception as e:
         errors_encountered.append(f"Structure analysis error: {str(e)}")
-        structure_results = {
-            'function_length_variance': 0.0,
-            'average_nesting_depth': 0.0,
-            'node_type_diversity': 0,
-            'control_flow_complexity': 0.0,
-            'structural_uniformity_score': 0.0,
-            'total_functions': 0
-        }
+        structure_results = _neutral_result(_STRUCTURE_DEFAULT)
     
     try:
-        ai_language_results = match_ai_language_patterns(code_string)
+        ai_language_results = match_ai_language_patterns(code_string, tree, walk)
     except Exception as e:
         errors_encountered.append(f"AI language analysis error: {str(e)}")
-        ai_language_results = {
-            'ai_phrases_found': [],
-            'ai_phrase_count': 0,
-            'conversational_indicators': 0,
-            'disclaimer_patterns': 0,
-            'confidence_level': 0.0
-        }
+        ai_language_results = _neutral_result(_AI_LANGUAGE_DEFAULT)
 
     try:
-        style_results = analyze_style_inconsistency(code_string)
+        style_results = analyze_style_inconsistency(code_string, tree, walk)
     except Exception as e:
         errors_encountered.append(f"Style analysis error: {str(e)}")
-        style_results = {
-            'style_fingerprints': [],
-            'inconsistency_count': 0,
-            'inconsistency_score': 0.0,
-            'inconsistent_patterns': [],
-            'total_code_blocks': 0
-        }
+        style_results = _neutral_result(_STYLE_DEFAULT)
 
     # Calculate summary statistics using the new sophisticated scoring system
     heuristic_results = {
@@ -1222,9 +1411,11 @@ def analyze(code_string: str) -> Dict[str, Any]:
         'code_structure': structure_results,
         'ai_language_patterns': ai_language_results,
         'style_inconsistency': style_results
-    }    # Calculate basic metrics for backward compatibility
-    total_indicators = 0
+    }
+    
+    # Calculate basic metrics for backward compatibility
     risk_factors = []
+    total_indicators = 0
     
     # Analyze comment patterns
     if comment_results['generic_comments'] > 0:
@@ -1305,80 +1496,3 @@ def analyze(code_string: str) -> Dict[str, Any]:
     }
     
     return comprehensive_results
-
-
-def _calculate_summary_statistics(
-    comment_results: Dict[str, Any],
-    variable_results: Dict[str, Any], 
-    structure_results: Dict[str, Any],
-    ai_language_results: Dict[str, Any]
-) -> Dict[str, Any]:
-    """
-    Calculate high-level summary statistics from all heuristic results.
-    
-    Args:
-        comment_results: Results from comment pattern analysis
-        variable_results: Results from variable naming analysis
-        structure_results: Results from code structure analysis
-        ai_language_results: Results from AI language pattern matching
-        
-    Returns:
-        Dict[str, Any]: Summary statistics including total indicators and risk factors
-    """
-    risk_factors = []
-    total_indicators = 0
-    
-    # Analyze comment patterns
-    if comment_results['generic_comments'] > 0:
-        risk_factors.append(f"Generic comments detected ({comment_results['generic_comments']})")
-        total_indicators += comment_results['generic_comments']
-    
-    if comment_results['comment_to_code_ratio'] > 0.8:
-        risk_factors.append(f"High comment-to-code ratio ({comment_results['comment_to_code_ratio']})")
-        total_indicators += 1
-    
-    if comment_results['repetitive_patterns'] > 0:
-        risk_factors.append(f"Repetitive comment patterns ({comment_results['repetitive_patterns']})")
-        total_indicators += 1
-    
-    # Analyze variable naming
-    if variable_results['generic_percentage'] > 50:
-        risk_factors.append(f"High generic variable usage ({variable_results['generic_percentage']}%)")
-        total_indicators += 1
-    
-    # Analyze code structure
-    if structure_results['structural_uniformity_score'] > 60:
-        risk_factors.append(f"High structural uniformity ({structure_results['structural_uniformity_score']})")
-        total_indicators += 1
-    
-    if structure_results['function_length_variance'] < 2.0 and structure_results['total_functions'] > 1:
-        risk_factors.append(f"Low function length variance ({structure_results['function_length_variance']})")
-        total_indicators += 1
-    
-    # Analyze AI language patterns
-    if ai_language_results['ai_phrase_count'] > 0:
-        risk_factors.append(f"AI language phrases detected ({ai_language_results['ai_phrase_count']})")
-        total_indicators += ai_language_results['ai_phrase_count']
-    
-    if ai_language_results['confidence_level'] > 50:
-        risk_factors.append(f"High AI language confidence ({ai_language_results['confidence_level']}%)")
-        total_indicators += 1
-    
-    # Calculate overall suspicion score
-    # This is a preliminary score; Task 8 will implement more sophisticated scoring
-    suspicion_factors = [
-        comment_results['generic_comments'] * 5,  # Weight generic comments heavily
-        min(comment_results['comment_to_code_ratio'] * 20, 20),  # Cap at 20 points
-        comment_results['repetitive_patterns'] * 3,
-        variable_results['generic_percentage'] * 0.5,  # Convert percentage to points
-        structure_results['structural_uniformity_score'] * 0.3,
-        ai_language_results['confidence_level'] * 0.4
-    ]
-    
-    overall_suspicion_score = round(min(sum(suspicion_factors), 100.0), 2)
-    
-    return {
-        'total_indicators': total_indicators,
-        'risk_factors': risk_factors,
-        'overall_suspicion_score': overall_suspicion_score
-    }
@@ -1,7 +1,7 @@
 # Multi-language file parser for Shadow AI Detection
 import os
 from pathlib import Path
-from typing import Dict, List, Tuple, Union
+from typing import Dict, Iterator, List, Tuple, Union
 
 
 class ParserError(Exception):
@@ -263,23 +263,19 @@ def read_source_with_language(source: Union[str, Path]) -> Tuple[str, str, str]:
     return content, language, source_identifier
 
 
-def parse_directory(dir_path: Union[str, Path], max_files: int = 5) -> List[Dict[str, str]]:
+def iter_parse_directory(dir_path: Union[str, Path], max_files: int = 5) -> Iterator[Dict[str, str]]:
     """
-    Parse multiple files from a directory for batch analysis.
+    Lazily parse files from a directory, yielding one file at a time.
     
-    Scans the given directory for source code files and processes up to max_files
-    of them. Files are selected based on recognized code file extensions and
-    processed in alphabetical order for consistency.
+    Same selection rules as parse_directory(), but only the file currently being
+    consumed is held in memory. Validation errors are raised on the first next().
     
     Args:
         dir_path: Path to the directory to scan
         max_files: Maximum number of files to process (default: 5)
         
-    Returns:
-        List of dictionaries, each containing:
-        - 'content': The file content as string
-        - 'language': Programming language name  
-        - 'source': File path
+    Yields:
+        Dictionaries with 'content', 'language' and 'source' keys
         
     Raises:
         FileNotFoundError: If the directory doesn't exist
@@ -303,38 +299,61 @@ def parse_directory(dir_path: Union[str, Path], max_files: int = 5) -> List[Dict
     if not os.access(directory, os.R_OK):
         raise PermissionError(f"Directory cannot be read (permission denied): {directory}")
     
-    results = []
     processed_count = 0
     
     try:
         # Get all files and sort them for consistent ordering
         all_files = sorted([f for f in directory.iterdir() if f.is_file()])
-        
-        for file_path in all_files:
-            # Stop if we've reached the maximum number of files
-            if processed_count >= max_files:
-                break
-            
-            # Check if it's a recognized code file
-            if LanguageMapper.is_code_file(file_path):
-                try:
-                    content, language, source = read_source_with_language(file_path)
-                    results.append({
-                        'content': content,
-                        'language': language,
-                        'source': source
-                    })
-                    processed_count += 1
-                except (UnicodeDecodeError, FileTooLargeError, PermissionError) as e:
-                    # Skip files that can't be processed, but continue with others
-                    # In a production environment, you might want to log these errors
-                    continue
-    
     except PermissionError:
         # Re-raise directory permission errors
         raise PermissionError(f"Cannot list directory contents: {directory}")
     
-    return results
+    for file_path in all_files:
+        # Stop if we've reached the maximum number of files
+        if processed_count >= max_files:
+            break
+        
+        # Check if it's a recognized code file
+        if LanguageMapper.is_code_file(file_path):
+            try:
+                content, language, source = read_source_with_language(file_path)
+            except (UnicodeDecodeError, FileTooLargeError, PermissionError) as e:
+                # Skip files that can't be processed, but continue with others
+                # In a production environment, you might want to log these errors
+                continue
+            processed_count += 1
+            yield {
+                'content': content,
+                'language': language,
+                'source': source
+            }
+
+
+def parse_directory(dir_path: Union[str, Path], max_files: int = 5) -> List[Dict[str, str]]:
+    """
+    Parse multiple files from a directory for batch analysis.
+    
+    Scans the given directory for source code files and processes up to max_files
+    of them. Files are selected based on recognized code file extensions and
+    processed in alphabetical order for consistency.
+    
+    Args:
+        dir_path: Path to the directory to scan
+        max_files: Maximum number of files to process (default: 5)
+        
+    Returns:
+        List of dictionaries, each containing:
+        - 'content': The file content as string
+        - 'language': Programming language name  
+        - 'source': File path
+        
+    Raises:
+        FileNotFoundError: If the directory doesn't exist
+        NotADirectoryError: If the path is not a directory
+        PermissionError: If the directory cannot be accessed
+        InvalidInputError: If max_files is invalid
+    """
+    return list(iter_parse_directory(dir_path, max_files=max_files))
 
 
 def get_directory_stats(dir_path: Union[str, Path]) -> Dict[str, int]:
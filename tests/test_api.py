@@ -6,6 +6,7 @@ from fastapi.testclient import TestClient
 from unittest.mock import patch, MagicMock
 
 # Import the FastAPI app
+import main
 from main import app
 
 
@@ -13,6 +14,14 @@ from main import app
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def clear_analysis_cache():
+    """Keep cached analyses from leaking between tests that patch the engine."""
+    main._analysis_cache.clear()
+    yield
+    main._analysis_cache.clear()
+
+
 class TestHealthEndpoint:
     """Test cases for the health check endpoint."""
     
@@ -133,7 +142,7 @@ class TestCodeAnalysisEndpoint:
         
         request_data = {
             "code": "def test(): pass",
-            "language": "python"
+            "language": "auto"
         }
         
         response = client.post("/api/check", json=request_data)
@@ -147,13 +156,66 @@ class TestCodeAnalysisEndpoint:
         
         request_data = {
             "code": "def test(): pass",
-            "language": "python"
+            "language": "auto"
         }
         
         response = client.post("/api/check", json=request_data)
         assert response.status_code == 400
         assert "No valid code content" in response.json()["detail"]
     
+    @patch('main.parse')
+    def test_analyze_explicit_language_skips_parser(self, mock_parse):
+        """Test that an explicit language bypasses the parser."""
+        request_data = {
+            "code": "def test(): pass",
+            "language": "python"
+        }
+
+        response = client.post("/api/check", json=request_data)
+        assert response.status_code == 200
+        assert response.json()["language"] == "python"
+        mock_parse.assert_not_called()
+
+    def test_analyze_explicit_language_null_bytes(self):
+        """Test that the explicit-language path still validates input."""
+        request_data = {
+            "code": "def test(): pass\x00",
+            "language": "python"
+        }
+
+        response = client.post("/api/check", json=request_data)
+        assert response.status_code == 400
+        assert "Invalid input" in response.json()["detail"]
+
+    def test_analyze_repeat_submission_is_cached(self):
+        """Test that identical code is only analyzed once."""
+        request_data = {
+            "code": "def cached(): return 42",
+            "language": "python"
+        }
+
+        with patch('main.analyze', wraps=main.analyze) as mock_analyze:
+            first = client.post("/api/check", json=request_data)
+            second = client.post("/api/check", json=request_data)
+
+        assert first.status_code == 200
+        assert second.status_code == 200
+        assert first.json()["confidence"] == second.json()["confidence"]
+        mock_analyze.assert_called_once()
+
+    def test_analyze_cached_returns_fresh_copy(self):
+        """Test that cache hits are independent copies with a new timestamp."""
+        code = "def cached_copy(): return 42"
+
+        first = main.analyze_cached(code)
+        first['summary']['risk_factors'].append('mutated')
+        first['analysis_metadata']['analysis_timestamp'] = 'stale'
+
+        second = main.analyze_cached(code)
+        assert second is not first
+        assert 'mutated' not in second['summary']['risk_factors']
+        assert second['analysis_metadata']['analysis_timestamp'] != 'stale'
+
     @patch('main.analyze')
     def test_analyze_engine_error(self, mock_analyze):
         """Test error handling when analysis engine fails."""
@@ -250,6 +312,18 @@ class TestFileUploadEndpoint:
         assert response.status_code == 400
         assert "Invalid input" in response.json()["detail"]  # Updated expected message
     
+    def test_analyze_latin1_file(self):
+        """Test that non-UTF-8 uploads are decoded with replacement characters."""
+        file_content = "# café\ndef greet():\n    return 'olé'\n".encode('latin-1')
+
+        response = client.post(
+            "/api/analyze",
+            files={"file": ("latin1.py", file_content, "text/plain")}
+        )
+
+        assert response.status_code == 200
+        assert response.json()["source"] == "latin1.py"
+
     def test_analyze_no_file(self):
         """Test error handling when no file is provided."""
         response = client.post("/api/analyze")
@@ -7,6 +7,7 @@ from unittest.mock import patch, MagicMock
 from pathlib import Path
 
 from shadow_ai.cli import main, create_parser, format_analysis_results
+from shadow_ai.cli import scan_directory
 
 
 class TestCLIParser:
@@ -40,6 +41,13 @@ class TestCLIParser:
         assert args.directory == '/path/to/dir'
         assert args.max_files == 10
 
+    def test_scan_jobs_parsing(self):
+
+        parser = create_parser()
+        args = parser.parse_args(['scan', '/path/to/dir', '--jobs', '4'])
+        assert args.jobs == 4
+        assert parser.parse_args(['scan', '/path/to/dir']).jobs is None
+
 
 class TestCLIFormatting:
 
@@ -103,8 +111,8 @@ class TestCLIFormatting:
 class TestCLIIntegration:
 
 
-    @patch('shadow_ai.cli.parse')
-    @patch('shadow_ai.cli.analyze')
+    @patch('shadow_ai.parser.parse')
+    @patch('shadow_ai.engine.analyze')
     def test_check_text_success(self, mock_analyze, mock_parse):
 
     # Mock the parse function
@@ -131,7 +139,7 @@ class TestCLIIntegration:
         assert 'raw_string' in output
         assert '30.0%' in output
 
-    @patch('shadow_ai.cli.parse')
+    @patch('shadow_ai.parser.parse')
     def test_check_text_invalid_input(self, mock_parse):
 
         from shadow_ai.parser import InvalidInputError
@@ -146,6 +154,156 @@ class TestCLIIntegration:
         assert 'Invalid input' in error_output
 
 
+class TestCLIScan:
+
+
+    def test_iter_analyzed_parallel_matches_sequential(self):
+
+        from shadow_ai.cli import iter_analyzed
+
+        contents = [
+            "def add(a, b):\n    return a + b\n",
+            "# Function to calculate sum\ndef total(values):\n    return sum(values)\n",
+            "class Greeter:\n    def greet(self, name):\n        return f'Hello {name}'\n",
+        ]
+
+        def parsed():
+            return [{'source': f'file{i}.py', 'language': 'Python', 'content': content}
+                    for i, content in enumerate(contents)]
+
+        sequential = list(iter_analyzed(parsed(), jobs=1))
+        parallel = list(iter_analyzed(parsed(), jobs=2))
+
+        assert [r['source'] for r in parallel] == [r['source'] for r in sequential]
+        assert [r['analysis']['summary'] for r in parallel] == \
+            [r['analysis']['summary'] for r in sequential]
+
+    def test_scan_directory_output(self, tmp_path, monkeypatch):
+
+        from shadow_ai import cli
+
+        cache_dir = tmp_path / 'cache'
+        monkeypatch.setattr(cli, 'CACHE_DIR', cache_dir)
+        scan_dir = tmp_path / 'src'
+        scan_dir.mkdir()
+        for name in ('a.py', 'b.py'):
+            (scan_dir / name).write_text("def hello():\n    return 'hi'\n")
+
+        with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
+            with patch('sys.argv', ['shadow-detect', 'scan', str(scan_dir), '--jobs', '2']):
+                result = main()
+
+        assert result == 0
+        output = mock_stdout.getvalue()
+        assert 'Found 2 code files' in output
+        assert 'a.py' in output and 'b.py' in output
+        assert not cache_dir.exists()
+
+    def test_iter_prefetched_preserves_order_and_errors(self):
+
+        from shadow_ai.cli import iter_prefetched
+
+        assert list(iter_prefetched(range(20), depth=2)) == list(range(20))
+
+        def failing():
+            yield 1
+            raise FileNotFoundError("missing")
+
+        with pytest.raises(FileNotFoundError):
+            list(iter_prefetched(failing()))
+
+    def test_quick_scan_skips_files_without_markers(self):
+
+        from shadow_ai.cli import iter_analyzed
+
+        parsed = [
+            {'source': 'plain.py', 'language': 'Python', 'content': "def add(a, b):\n    return a + b\n"},
+            {'source': 'data.py', 'language': 'Python', 'content': "def process_data(data):\n    return data\n"},
+            {'source': 'marked.py', 'language': 'Python', 'content': "# Hope This Helps!\ndef add(a, b):\n    return a + b\n"},
+        ]
+
+        with patch('shadow_ai.engine.analyze', return_value={'summary': {}}) as mock_analyze:
+            results = list(iter_analyzed(parsed, jobs=1, quick=True))
+
+        mock_analyze.assert_called_once()
+        assert results[0]['analysis']['analysis_metadata']['quick_rejected'] is True
+        assert results[1]['analysis']['analysis_metadata']['quick_rejected'] is True
+        assert results[2]['analysis'] == {'summary': {}}
+
+    def test_iter_analyzed_single_file_skips_process_pool(self):
+
+        from shadow_ai.cli import iter_analyzed
+
+        parsed = [{'source': 'one.py', 'language': 'Python', 'content': "def add(a, b):\n    return a + b\n"}]
+
+        with patch('shadow_ai.cli.ProcessPoolExecutor') as mock_executor:
+            results = list(iter_analyzed(parsed, jobs=4))
+
+        mock_executor.assert_not_called()
+        assert results[0]['analysis']['summary']['total_indicators'] >= 0
+
+    def test_analyze_cached_reuses_stored_result(self, tmp_path, monkeypatch):
+
+        from shadow_ai import cli
+
+        monkeypatch.setattr(cli, 'CACHE_DIR', tmp_path)
+        content = "def add(a, b):\n    return a + b\n"
+
+        first = cli.analyze_cached(content)
+        assert len(list(tmp_path.glob('*.json'))) == 1
+
+        with patch('shadow_ai.engine.analyze') as mock_analyze:
+            second = cli.analyze_cached(content)
+
+        mock_analyze.assert_not_called()
+        assert second['summary'] == first['summary']
+
+    def test_analyze_cached_keeps_bounded_entries(self, tmp_path, monkeypatch):
+
+        from shadow_ai import cli
+
+        monkeypatch.setattr(cli, 'CACHE_DIR', tmp_path)
+        monkeypatch.setattr(cli, 'CACHE_MAX_ENTRIES', 2)
+
+        for i in range(4):
+            cli.analyze_cached(f"def f{i}():\n    return {i}\n")
+        assert len(list(tmp_path.glob('*.json'))) == 4
+
+        cli.prune_cache()
+        assert len(list(tmp_path.glob('*.json'))) == 2
+
+    def test_prune_cache_skips_vanished_entries(self, tmp_path, monkeypatch):
+
+        import contextlib
+        import os
+        from shadow_ai import cli
+
+        monkeypatch.setattr(cli, 'CACHE_DIR', tmp_path)
+        monkeypatch.setattr(cli, 'CACHE_MAX_ENTRIES', 1)
+        for i in range(3):
+            (tmp_path / f"{i}.json").write_text('{}')
+
+        real_scandir = os.scandir
+
+        def scandir_then_unlink(path):
+            entries = list(real_scandir(path))
+            os.unlink(entries[0].path)
+            return contextlib.nullcontext(entries)
+
+        monkeypatch.setattr(cli.os, 'scandir', scandir_then_unlink)
+        cli.prune_cache()
+
+        assert len(list(tmp_path.glob('*.json'))) == 1
+
+    def test_scan_missing_directory(self, tmp_path):
+
+        with patch('sys.stderr', new_callable=StringIO) as mock_stderr:
+            result = scan_directory(str(tmp_path / 'missing'))
+
+        assert result == 1
+        assert 'Directory not found' in mock_stderr.getvalue()
+
+
 class TestCLIMain:
 
 